@@ -5,6 +5,9 @@
 -- Create extension for UUID generation
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Create extension for embedding similarity search (pgvector)
+CREATE EXTENSION IF NOT EXISTS vector;
+
 -- Email Processing Records Table
 CREATE TABLE IF NOT EXISTS email_records (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -111,10 +114,34 @@ CREATE TABLE IF NOT EXISTS processing_logs (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- GPT Response Cache Table (exact-match reuse of GPT analyses)
+CREATE TABLE IF NOT EXISTS gpt_response_cache (
+    cache_key BYTEA PRIMARY KEY,    -- blake2b digest of normalized request
+    response JSONB NOT NULL,
+    model VARCHAR(100),
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Email Embeddings Table (semantic reuse of GPT analyses)
+-- Dimension matches OPENAI_EMBEDDING_MODEL (text-embedding-3-small)
+CREATE TABLE IF NOT EXISTS email_embeddings (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    namespace CHAR(64) NOT NULL,    -- sha256 of sender + user context
+    embedding vector(1536) NOT NULL,
+    response JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
 -- Indexes for performance
-CREATE INDEX idx_email_records_email_id ON email_records(email_id);
+-- (email_id lookups and ON CONFLICT use the UNIQUE constraint's index)
 CREATE INDEX idx_email_records_sender_email ON email_records(sender_email);
-CREATE INDEX idx_email_records_received_datetime ON email_records(received_datetime DESC);
+-- Covers the statistics aggregates so the time window is an index-only scan
+CREATE INDEX idx_email_records_received_datetime ON email_records(received_datetime DESC)
+    INCLUDE (category, confidence, should_respond, skipped_gpt, human_review_required,
+             processing_time_seconds, gpt_tokens_used);
 CREATE INDEX idx_email_records_category ON email_records(category);
 CREATE INDEX idx_email_records_confidence ON email_records(confidence);
 CREATE INDEX idx_email_records_human_review ON email_records(human_review_required) WHERE human_review_required = TRUE;
@@ -125,6 +152,14 @@ CREATE INDEX idx_email_responses_email_record_id ON email_responses(email_record
 CREATE INDEX idx_processing_logs_email_record_id ON processing_logs(email_record_id);
 CREATE INDEX idx_processing_logs_created_at ON processing_logs(created_at DESC);
 
+-- Semantic lookups filter to one namespace and rank its few live rows
+-- exactly. No ANN (HNSW) index: it scans a fixed candidate list across all
+-- namespaces before the namespace filter, so busy senders would crowd out
+-- everyone else's matches.
+CREATE INDEX idx_email_embeddings_namespace ON email_embeddings(namespace, expires_at);
+CREATE INDEX idx_email_embeddings_expires_at ON email_embeddings(expires_at);
+CREATE INDEX idx_gpt_response_cache_expires_at ON gpt_response_cache(expires_at);
+
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
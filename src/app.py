@@ -12,113 +12,123 @@ Version: 2.0
 """
 
 import os
-import json
+import atexit
+import queue
+import re
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import time
+import hashlib
+import hmac
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, replace
 from flask import Flask, request, jsonify
-from functools import wraps
+from flask.json.provider import DefaultJSONProvider
+from functools import partial, wraps
 import traceback
 
+import ahocorasick
+import httpx
+import orjson
+from jinja2 import Environment
+from openai import OpenAI
+
 # Import database module
-from database import init_database_pool, EmailDatabase
+from database import init_database_pool, EmailDatabase, StepLogger, ResponseCache, SemanticCache
+from models import (
+    EmailContext, FilterResult, SensitivityResult, GPTResponse, ProcessingDecision, APIResponse
+)
+
+# Configure comprehensive logging. Request threads only enqueue records;
+# a background listener thread owns the file and console handlers.
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(
+    log_queue,
+    logging.FileHandler('/var/log/redi/email_processor.log'),
+    logging.StreamHandler()
+)
+log_listener.start()
+atexit.register(log_listener.stop)
 
-# Configure comprehensive logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/var/log/redi/email_processor.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
 
 logger = logging.getLogger(__name__)
 
-# Initialize database pool (global)
+# Initialize database pools (global); dashboard reads use their own
+# read-only pool so they cannot starve the write path
 db_pool = init_database_pool()
-email_db = EmailDatabase(db_pool)
+read_db_pool = init_database_pool(read_only=True)
+email_db = EmailDatabase(db_pool, read_db_pool)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that parses and serializes with orjson.
+    
+    Keeps the default provider's key sorting and its fallback handling
+    for dates, decimals, UUIDs and dataclasses, but hands the encoded
+    bytes straight to the response without a str round trip.
+    """
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def _options(self, sort_keys: bool) -> int:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._options(kwargs.get('sort_keys', self.sort_keys))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Load configuration from environment
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o')
 OPENAI_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', '0'))
 OPENAI_MAX_TOKENS = int(os.getenv('OPENAI_MAX_TOKENS', '1000'))
+OPENAI_EMBEDDING_MODEL = os.getenv('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+
+# OpenAI quota limits, per worker process (0 disables that limit)
+OPENAI_MAX_CONCURRENT = int(os.getenv('OPENAI_MAX_CONCURRENT', '8'))
+OPENAI_RPM_LIMIT = int(os.getenv('OPENAI_RPM_LIMIT', '250'))
+OPENAI_TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', '15000'))
+
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '604800'))
+RESPONSE_CACHE_LOCAL_SIZE = int(os.getenv('RESPONSE_CACHE_LOCAL_SIZE', '10000'))
+RESPONSE_CACHE_LOCAL_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_LOCAL_TTL_SECONDS', '600'))
+
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv('SEMANTIC_CACHE_TTL_SECONDS', '86400'))
 
 CONFIDENCE_THRESHOLD_HIGH = float(os.getenv('CONFIDENCE_THRESHOLD_HIGH', '0.8'))
 CONFIDENCE_THRESHOLD_MODERATE = float(os.getenv('CONFIDENCE_THRESHOLD_MODERATE', '0.5'))
 CONFIDENCE_THRESHOLD_LOW = float(os.getenv('CONFIDENCE_THRESHOLD_LOW', '0.3'))
 
 API_KEY = os.getenv('REDI_API_KEY', 'your-secure-api-key-here')
-
-
-# ============================================================================
-# DATA MODELS
-# ============================================================================
-
-@dataclass
-class EmailContext:
-    """Context data about the user (bookings, certificates)"""
-    user_bookings: List[Dict[str, Any]]
-    user_certificates: List[Dict[str, Any]]
-
-
-@dataclass
-class FilterResult:
-    """Result of pre-filtering check"""
-    skip_gpt: bool
-    reason: str
-    confidence: float
-    category: str
-
-
-@dataclass
-class SensitivityResult:
-    """Result of sensitivity detection"""
-    flags: List[str]
-    max_confidence: float
-    should_block: bool
-    reasoning: str
-
-
-@dataclass
-class GPTResponse:
-    """Structured response from GPT"""
-    is_new_email: bool
-    sender_first_name: str
-    enquiry_type: str
-    recommended_response: str
-    confidence: float
-    action: str
-
-
-@dataclass
-class ProcessingDecision:
-    """Final decision about how to handle email"""
-    should_respond: bool
-    confidence: float
-    category: str
-    action: str
-    reasoning_chain: List[str]
-    sensitivity_flags: List[str]
-
-
-@dataclass
-class APIResponse:
-    """Complete API response structure"""
-    success: bool
-    processing_time: float
-    decision: ProcessingDecision
-    response: Optional[Dict[str, Any]]
-    actions: List[Dict[str, Any]]
-    human_review: Dict[str, Any]
-    metadata: Dict[str, Any]
-    error: Optional[Dict[str, Any]] = None
+API_KEY_BYTES = API_KEY.encode()
 
 
 # ============================================================================
@@ -149,10 +159,11 @@ def require_api_key(f):
                 }
             }), 401
         
-        api_key = auth_header.replace('Bearer ', '')
+        api_key = auth_header.removeprefix('Bearer ')
         
-        if api_key != API_KEY:
-            logger.warning(f"Invalid API key attempted: {api_key[:10]}...")
+        # Constant-time comparison so response timing does not leak the key
+        if not hmac.compare_digest(api_key.encode(), API_KEY_BYTES):
+            logger.warning("Invalid API key attempted")
             return jsonify({
                 'success': False,
                 'error': {
@@ -166,10 +177,77 @@ def require_api_key(f):
     return decorated
 
 
+# ============================================================================
+# EMAIL NORMALIZATION
+# ============================================================================
+
+@dataclass(slots=True, frozen=True)
+class NormalizedEmail:
+    """Lowercased email fields shared by the pre-filter and sensitivity detector"""
+    subject: str
+    body: str
+    from_email: str
+    
+    @classmethod
+    def from_request(cls, email: Dict[str, Any]) -> 'NormalizedEmail':
+        """
+        Lowercase the subject, body and sender address of a request.
+        
+        Built once at request entry so the pre-filter and sensitivity
+        detector share one lowercased copy of each field. Missing or null
+        fields become empty strings.
+        
+        Args:
+            email: Email data dictionary
+            
+        Returns:
+            NormalizedEmail for the request
+        """
+        return cls(
+            subject=(email.get('subject') or '').lower(),
+            body=(email.get('bodyText') or '').lower(),
+            from_email=((email.get('from') or {}).get('email') or '').lower()
+        )
+
+
 # ============================================================================
 # PRE-FILTERING MODULE
 # ============================================================================
 
+# Header-field phrase buckets compiled once at import; each check is a single regex search
+_SUBJECT_OOO_RE = re.compile(r'out of office|automatic reply|autoreply|out of the office')
+_SYSTEM_FROM_RE = re.compile(r'noreply@|donotreply@|no-reply@|mailer-daemon')
+_DELIVERY_RE = re.compile(
+    r'undeliverable|delivery status notification|returned mail|mail delivery failed'
+)
+_MARKETING_FROM_RE = re.compile(r'marketing@|newsletter@|promo@')
+_THREAD_PREFIX_RE = re.compile(r'^(?:re|fwd|fw):')
+
+
+def _build_phrase_automaton(phrases: List[str]) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over a list of phrases.
+    
+    Args:
+        phrases: Lowercase phrases to match
+        
+    Returns:
+        Automaton whose values are the matched phrases
+    """
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+# The body is the only unbounded field, so it gets a single linear
+# Aho-Corasick pass instead of a regex alternation
+_SPAM_BODY_AUTOMATON = _build_phrase_automaton(
+    ['unsubscribe', 'click here to buy', 'limited time offer', 'act now']
+)
+
+
 class PreFilter:
     """
     Pre-filtering logic to skip GPT for obvious cases.
@@ -182,30 +260,25 @@ class PreFilter:
     """
     
     @staticmethod
-    def should_skip_gpt(email: Dict[str, Any]) -> FilterResult:
+    def should_skip_gpt(email: NormalizedEmail) -> FilterResult:
         """
         Determine if email should skip GPT processing.
         
         Args:
-            email: Email data dictionary
+            email: Normalized email fields
             
         Returns:
             FilterResult with skip decision and metadata
         """
-        logger.info(f"Pre-filtering email: {email.get('subject', 'No subject')}")
+        logger.debug("Pre-filtering email: %s", email.subject or 'No subject')
         
-        subject = email.get('subject', '').lower()
-        body = email.get('bodyText', '').lower()
-        from_email = email.get('from', {}).get('email', '').lower()
+        subject = email.subject
+        body = email.body
+        from_email = email.from_email
         
         # Check for out of office
-        if any(phrase in subject for phrase in [
-            'out of office',
-            'automatic reply',
-            'autoreply',
-            'out of the office'
-        ]):
-            logger.info("Filtered: Out of office reply detected")
+        if _SUBJECT_OOO_RE.search(subject):
+            logger.debug("Filtered: Out of office reply detected")
             return FilterResult(
                 skip_gpt=True,
                 reason='out_of_office',
@@ -214,13 +287,8 @@ class PreFilter:
             )
         
         # Check for system notifications
-        if any(sender in from_email for sender in [
-            'noreply@',
-            'donotreply@',
-            'no-reply@',
-            'mailer-daemon'
-        ]):
-            logger.info(f"Filtered: System notification from {from_email}")
+        if _SYSTEM_FROM_RE.search(from_email):
+            logger.debug("Filtered: System notification from %s", from_email)
             return FilterResult(
                 skip_gpt=True,
                 reason='system_notification',
@@ -229,13 +297,8 @@ class PreFilter:
             )
         
         # Check for delivery failures
-        if any(phrase in subject for phrase in [
-            'undeliverable',
-            'delivery status notification',
-            'returned mail',
-            'mail delivery failed'
-        ]):
-            logger.info("Filtered: Delivery failure notification")
+        if _DELIVERY_RE.search(subject):
+            logger.debug("Filtered: Delivery failure notification")
             return FilterResult(
                 skip_gpt=True,
                 reason='delivery_failure',
@@ -244,17 +307,9 @@ class PreFilter:
             )
         
         # Check for spam/marketing
-        if any(phrase in body for phrase in [
-            'unsubscribe',
-            'click here to buy',
-            'limited time offer',
-            'act now'
-        ]) or any(sender in from_email for sender in [
-            'marketing@',
-            'newsletter@',
-            'promo@'
-        ]):
-            logger.info("Filtered: Spam/marketing detected")
+        if (next(_SPAM_BODY_AUTOMATON.iter(body), None) is not None or
+                _MARKETING_FROM_RE.search(from_email)):
+            logger.debug("Filtered: Spam/marketing detected")
             return FilterResult(
                 skip_gpt=True,
                 reason='spam_marketing',
@@ -263,8 +318,8 @@ class PreFilter:
             )
         
         # Check for ongoing threads
-        if any(subject.startswith(prefix) for prefix in ['re:', 'fwd:', 'fw:']):
-            logger.info("Detected ongoing thread - will lower confidence")
+        if _THREAD_PREFIX_RE.search(subject):
+            logger.debug("Detected ongoing thread - will lower confidence")
             return FilterResult(
                 skip_gpt=False,
                 reason='ongoing_thread',
@@ -273,7 +328,7 @@ class PreFilter:
             )
         
         # No filter matched - proceed to GPT
-        logger.info("No pre-filter matched - proceeding to GPT")
+        logger.debug("No pre-filter matched - proceeding to GPT")
         return FilterResult(
             skip_gpt=False,
             reason='none',
@@ -340,57 +395,60 @@ class SensitivityDetector:
     }
     
     @staticmethod
-    def detect(email: Dict[str, Any]) -> SensitivityResult:
+    def detect(email: NormalizedEmail) -> SensitivityResult:
         """
         Detect sensitivity issues in email content.
         
         Args:
-            email: Email data dictionary
+            email: Normalized email fields
             
         Returns:
             SensitivityResult with detected flags and constraints
         """
-        logger.info("Running sensitivity detection...")
+        logger.debug("Running sensitivity detection...")
+        
+        combined_text = f"{email.subject} {email.body}"
         
-        subject = email.get('subject', '').lower()
-        body = email.get('bodyText', '').lower()
-        combined_text = f"{subject} {body}"
+        # Single pass over the text collects every keyword hit per category
+        hits: Dict[str, set] = {}
+        for _, (category, keyword) in _SENSITIVITY_AUTOMATON.iter(combined_text):
+            if category in hits:
+                hits[category].add(keyword)
+            else:
+                hits[category] = {keyword}
         
         detected_flags = []
         min_confidence = 1.0  # Start at max, reduce as we find issues
         should_block = False
         reasoning_parts = []
         
-        # Check each sensitivity category
+        # Report categories in pattern order, keywords in list order
         for category, config in SensitivityDetector.SENSITIVITY_PATTERNS.items():
-            keywords = config['keywords']
-            max_conf = config['max_confidence']
-            block = config['block']
+            if category not in hits:
+                continue
             
-            # Check if any keywords match
-            matches = [kw for kw in keywords if kw in combined_text]
+            matches = [kw for kw in config['keywords'] if kw in hits[category]]
             
-            if matches:
-                detected_flags.append(category)
-                min_confidence = min(min_confidence, max_conf)
-                if block:
-                    should_block = True
-                
-                reasoning_parts.append(
-                    f"Detected {category}: {', '.join(matches[:3])}"
-                )
-                
-                logger.warning(
-                    f"SENSITIVITY ALERT: {category} detected - "
-                    f"matches: {matches[:3]}"
-                )
+            detected_flags.append(category)
+            min_confidence = min(min_confidence, config['max_confidence'])
+            if config['block']:
+                should_block = True
+            
+            reasoning_parts.append(
+                f"Detected {category}: {', '.join(matches[:3])}"
+            )
+            
+            logger.warning(
+                "SENSITIVITY ALERT: %s detected - matches: %s",
+                category, matches[:3]
+            )
         
         # Build reasoning string
         if detected_flags:
             reasoning = "; ".join(reasoning_parts)
         else:
             reasoning = "No sensitivity issues detected"
-            logger.info("No sensitivity flags detected")
+            logger.debug("No sensitivity flags detected")
         
         return SensitivityResult(
             flags=detected_flags,
@@ -400,16 +458,275 @@ class SensitivityDetector:
         )
 
 
+def _build_sensitivity_automaton(patterns: Dict[str, Dict[str, Any]]) -> ahocorasick.Automaton:
+    """
+    Build an Aho-Corasick automaton over all sensitivity keywords.
+    
+    Args:
+        patterns: Sensitivity pattern mapping (category -> config)
+        
+    Returns:
+        Automaton whose values are (category, keyword) tuples
+    """
+    automaton = ahocorasick.Automaton()
+    for category, config in patterns.items():
+        for keyword in config['keywords']:
+            automaton.add_word(keyword, (category, keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import; matching is a single linear scan per email
+_SENSITIVITY_AUTOMATON = _build_sensitivity_automaton(SensitivityDetector.SENSITIVITY_PATTERNS)
+
+
 # ============================================================================
 # GPT CLIENT MODULE
 # ============================================================================
 
+# One keep-alive pool per process, so TLS sessions to the OpenAI API are
+# reused across requests instead of being set up for every client
+openai_http_client = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+)
+
+# Static instructions sent as the first message of every GPT request. Only
+# the user message varies, so the prompt prefix is byte-identical across
+# requests and workers and eligible for OpenAI's automatic prompt caching.
+SYSTEM_PROMPT = """
+You are REdI-AI, an automated email assistant for the Resuscitation Education Initiative.
+
+Analyze emails and respond with JSON containing:
+- is_new_email: boolean
+- sender_first_name: string
+- enquiry_type: string (1-3 words)
+- recommended_response: string
+- confidence: number (0-1)
+- action: "send_certificate" | "cancel" | "none"
+
+Confidence scoring:
+- 0.1-0.2: System messages, complaints, urgent matters
+- 0.5-0.7: General enquiries, needs clarification
+- 0.8-0.95: Clear actionable requests
+
+NEVER respond to: complaints, escalations, HR issues, negative sentiment.
+Always include booking app link: https://tinyurl.com/bookREdIALS
+"""
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter for OpenAI concurrency, request and token quotas.
+    
+    Requests and tokens are counted over a sliding 60 second window. Token
+    usage is reserved from an estimate before the call and settled with
+    the actual usage afterwards.
+    """
+    
+    WINDOW_SECONDS = 60.0
+    
+    def __init__(self, max_concurrent: int, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            max_concurrent: Maximum in-flight calls (0 = unlimited)
+            requests_per_minute: Request quota per window (0 = unlimited)
+            tokens_per_minute: Token quota per window (0 = unlimited)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._semaphore = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._condition = threading.Condition()
+        self._calls = deque()  # [timestamp, tokens] per call in window
+        self._tokens_in_window = 0
+        self._pruned_until = float('-inf')  # calls at or before this left _calls
+        
+        logger.info(
+            "Rate limiter initialized: concurrent=%s, rpm=%s, tpm=%s",
+            max_concurrent, requests_per_minute, tokens_per_minute
+        )
+    
+    @contextmanager
+    def limit(self, estimated_tokens: int):
+        """
+        Hold a call slot for the duration of an API call.
+        
+        Args:
+            estimated_tokens: Expected prompt + completion tokens
+            
+        Yields:
+            Reservation to pass to settle() once actual usage is known
+        """
+        if self._semaphore:
+            self._semaphore.acquire()
+        try:
+            yield self._reserve(estimated_tokens)
+        finally:
+            if self._semaphore:
+                self._semaphore.release()
+    
+    def settle(self, reservation: list, actual_tokens: int):
+        """
+        Replace a reservation's estimate with actual token usage.
+        
+        A reservation that has already aged out of the window (e.g. after
+        a slow call or retries) no longer counts towards the total, so it
+        is left alone.
+        
+        Args:
+            reservation: Value yielded by limit()
+            actual_tokens: Tokens reported by the API
+        """
+        with self._condition:
+            # _calls is in timestamp order and pruned from the front
+            if reservation[0] <= self._pruned_until:
+                return
+            self._tokens_in_window += actual_tokens - reservation[1]
+            reservation[1] = actual_tokens
+            self._condition.notify_all()
+    
+    def _reserve(self, tokens: int) -> list:
+        """Block until the call fits in the window, then record it."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                window_start = now - self.WINDOW_SECONDS
+                while self._calls and self._calls[0][0] <= window_start:
+                    _, expired_tokens = self._calls.popleft()
+                    self._tokens_in_window -= expired_tokens
+                self._pruned_until = window_start
+                
+                requests_ok = (
+                    not self.requests_per_minute or
+                    len(self._calls) < self.requests_per_minute
+                )
+                # A single oversized call is allowed through an empty window
+                tokens_ok = (
+                    not self.tokens_per_minute or
+                    not self._calls or
+                    self._tokens_in_window + tokens <= self.tokens_per_minute
+                )
+                
+                if requests_ok and tokens_ok:
+                    reservation = [now, tokens]
+                    self._calls.append(reservation)
+                    self._tokens_in_window += tokens
+                    return reservation
+                
+                wait = self._calls[0][0] + self.WINDOW_SECONDS - now
+                logger.warning("OpenAI rate limit reached - waiting %.1fs", wait)
+                self._condition.wait(wait)
+
+
+class EmbeddingBatcher:
+    """
+    Background thread that batches embedding requests.
+    
+    Callers queue a text and block on a future. The thread collects up to
+    BATCH_SIZE texts, waiting at most MAX_WAIT_SECONDS after the first,
+    and embeds them in a single API call.
+    """
+    
+    BATCH_SIZE = 32
+    MAX_WAIT_SECONDS = 0.01
+    # Bounds both the API call and how long a caller waits for its vector;
+    # a missing embedding only costs a semantic cache miss
+    TIMEOUT_SECONDS = 10.0
+    
+    def __init__(self, client: OpenAI, model: str):
+        """
+        Initialize and start the batching thread.
+        
+        Args:
+            client: OpenAI client used for embedding calls
+            model: Embedding model name
+        """
+        self.client = client
+        self.model = model
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._thread.start()
+        
+        logger.info("Embedding batcher started: model=%s, batch_size=%s", model, self.BATCH_SIZE)
+    
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Queue text for embedding and wait for the result.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector or None if error
+        """
+        if not self._thread.is_alive():
+            logger.warning("Embedding batcher thread is not running")
+            return None
+        
+        future = Future()
+        self._queue.put((text, future))
+        try:
+            return future.result(timeout=self.TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            logger.warning("Embedding timed out after %ss", self.TIMEOUT_SECONDS)
+            return None
+    
+    def _run(self):
+        """Collect queued texts into batches and embed them."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.MAX_WAIT_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            self._embed_batch(batch)
+    
+    def _embed_batch(self, batch: List[tuple]):
+        """Embed a batch of (text, future) pairs in one API call."""
+        try:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=[text for text, _ in batch],
+                timeout=self.TIMEOUT_SECONDS
+            )
+            embeddings = {item.index: item.embedding for item in response.data}
+            if len(embeddings) < len(batch):
+                logger.warning(
+                    "Embedding response had %s of %s vectors", len(embeddings), len(batch)
+                )
+            # A text with no vector in the response resolves to None
+            for index, (_, future) in enumerate(batch):
+                future.set_result(embeddings.get(index))
+            
+        except Exception as e:
+            logger.warning("Embedding call failed for batch of %s: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+
 class GPTClient:
     """
     OpenAI GPT API client with retry logic and error handling.
     """
 
-    def __init__(self, api_key: str, model: str, temperature: float, max_tokens: int):
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        rate_limiter: Optional[RateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         """
         Initialize GPT client.
 
@@ -418,16 +735,23 @@ class GPTClient:
             model: Model name (e.g., 'gpt-4o')
             temperature: Temperature setting (0-1)
             max_tokens: Maximum tokens in response
+            rate_limiter: Optional limiter shared by all clients in the process
+            response_cache: Optional shared cache for identical requests
+            semantic_cache: Optional cache for near-duplicate emails
         """
-        from openai import OpenAI
-
         self.api_key = api_key
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = OpenAI(api_key=api_key)
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.client = OpenAI(api_key=api_key, http_client=openai_http_client)
+        self.embedder = (
+            EmbeddingBatcher(self.client, OPENAI_EMBEDDING_MODEL) if semantic_cache else None
+        )
 
-        logger.info(f"GPT Client initialized: {model}, temp={temperature}")
+        logger.info("GPT Client initialized: %s, temp=%s", model, temperature)
     
     def call_gpt(
         self,
@@ -446,60 +770,153 @@ class GPTClient:
         Returns:
             GPTResponse object or None if error
         """
+        # Identical emails (retries, duplicate deliveries) reuse a prior answer.
+        # A cache failure only costs a miss, never the analysis.
+        cache_key = None
+        if self.response_cache:
+            try:
+                cache_key = response_cache_key(
+                    email, context, system_prompt, self.model, self.temperature
+                )
+                cached = self.response_cache.get(cache_key)
+                if cached:
+                    logger.info("Response cache hit - skipping GPT call")
+                    return replace(GPTResponse.from_dict(cached), cache_hit=True)
+            except Exception as e:
+                logger.warning("Response cache lookup failed: %s", e)
+                cache_key = None
+        
+        # Near-duplicate emails from the same sender/context reuse a prior answer
+        cache_namespace = None
+        embedding = None
+        if self.semantic_cache:
+            try:
+                cache_namespace = semantic_cache_namespace(email, context)
+                embedding = self.embed(semantic_cache_text(email))
+                if embedding:
+                    cached = self.semantic_cache.lookup(cache_namespace, embedding)
+                    if cached:
+                        logger.info("Semantic cache hit - skipping GPT call")
+                        return replace(GPTResponse.from_dict(cached), cache_hit=True)
+            except Exception as e:
+                logger.warning("Semantic cache lookup failed: %s", e)
+                embedding = None
+
         try:
             # Build user message with email and context
             user_message = self._build_user_message(email, context)
 
-            logger.info(f"Calling GPT API: {self.model}")
-            logger.debug(f"User message length: {len(user_message)} chars")
+            logger.info("Calling GPT API: %s", self.model)
+            logger.debug("User message length: %d chars", len(user_message))
 
             # Call OpenAI API (v1.x syntax)
-            start_time = time.time()
+            start_time = time.perf_counter()
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+            response = self._create_completion(
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                response_format={"type": "json_object"}
+                max_tokens=self.max_tokens
             )
 
-            api_time = time.time() - start_time
+            api_time = time.perf_counter() - start_time
 
             # Extract response (v1.x uses attributes instead of dict access)
             content = response.choices[0].message.content
             tokens_used = response.usage.total_tokens
 
-            logger.info(
-                f"GPT API call successful: {api_time:.2f}s, "
-                f"{tokens_used} tokens"
-            )
+            logger.info("GPT API call successful: %.2fs, %d tokens", api_time, tokens_used)
             
             # Parse JSON response
-            result = json.loads(content)
+            gpt_response = GPTResponse.from_dict(orjson.loads(content))
             
-            return GPTResponse(
-                is_new_email=result.get('is_new_email', True),
-                sender_first_name=result.get('sender_first_name', ''),
-                enquiry_type=result.get('enquiry_type', 'general'),
-                recommended_response=result.get('recommended_response', ''),
-                confidence=result.get('confidence', 0.5),
-                action=result.get('action', 'none')
-            )
+            if cache_key:
+                self.response_cache.put(cache_key, gpt_response.to_dict(), self.model)
+            if embedding:
+                self.semantic_cache.add(cache_namespace, embedding, gpt_response.to_dict())
+            
+            return gpt_response
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse GPT JSON response: {e}")
-            logger.error(f"Raw response: {content[:500]}")
+        except ValueError as e:
+            # Covers orjson.JSONDecodeError as well as schema violations
+            logger.error("Failed to parse GPT JSON response: %s", e)
+            logger.error("Raw response: %.500s", content)
             return None
             
         except Exception as e:
-            logger.error(f"GPT API call failed: {e}")
+            logger.error("GPT API call failed: %s", e)
             logger.error(traceback.format_exc())
             return None
     
+    def _create_completion(self, messages: List[Dict[str, str]], max_tokens: int):
+        """
+        Send a JSON-mode chat completion, respecting the rate limiter.
+        
+        Args:
+            messages: Chat messages
+            max_tokens: Completion token cap
+            
+        Returns:
+            OpenAI chat completion response
+        """
+        def create():
+            return self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                messages=messages,
+                response_format={"type": "json_object"}
+            )
+        
+        if not self.rate_limiter:
+            return create()
+        
+        # Rough prompt estimate (~4 chars per token) plus the completion cap
+        estimated_tokens = sum(len(m['content']) for m in messages) // 4 + max_tokens
+        with self.rate_limiter.limit(estimated_tokens) as reservation:
+            response = create()
+            self.rate_limiter.settle(reservation, response.usage.total_tokens)
+            return response
+    
+    def warm_up(self):
+        """
+        Open a keep-alive connection to the OpenAI API ahead of the first email.
+        
+        Makes one cheap models.retrieve call so the TCP and TLS handshake
+        happens at startup and the connection waits in the shared pool.
+        Failures are logged and ignored.
+        """
+        try:
+            self.client.models.retrieve(self.model, timeout=2.0)
+            logger.info("OpenAI connection warmed up")
+        except Exception as e:
+            logger.warning("OpenAI warm-up failed: %s", e)
+    
+    def embed(self, text: str) -> Optional[List[float]]:
+        """
+        Get an embedding vector for text.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector or None if error
+        """
+        if self.embedder:
+            return self.embedder.embed(text)
+        
+        try:
+            response = self.client.embeddings.create(
+                model=OPENAI_EMBEDDING_MODEL,
+                input=text
+            )
+            return response.data[0].embedding
+            
+        except Exception as e:
+            logger.warning("Embedding call failed: %s", e)
+            return None
+    
     def _build_user_message(
         self,
         email: Dict[str, Any],
@@ -518,7 +935,7 @@ class GPTClient:
         message = f"""
 Email Details:
 --------------
-From: {email.get('from', {}).get('name', '')} <{email.get('from', {}).get('email', '')}>
+From: {(email.get('from') or {}).get('name', '')} <{(email.get('from') or {}).get('email', '')}>
 Subject: {email.get('subject', '')}
 Received: {email.get('receivedDateTime', '')}
 
@@ -528,16 +945,116 @@ Body:
 User Context:
 -------------
 Upcoming Bookings ({len(context.user_bookings)}):
-{json.dumps(context.user_bookings, indent=2)}
+{orjson.dumps(context.user_bookings, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()}
 
 Completed Certificates ({len(context.user_certificates)}):
-{json.dumps(context.user_certificates, indent=2)}
+{orjson.dumps(context.user_certificates, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()}
 
 Please analyze this email and provide your response in JSON format.
 """
         return message
 
 
+# ============================================================================
+# RESPONSE CACHE MODULE
+# ============================================================================
+
+def response_cache_key(
+    email: Dict[str, Any],
+    context: EmailContext,
+    system_prompt: str,
+    model: str,
+    temperature: float
+) -> bytes:
+    """
+    Build the response cache key for an email request.
+    
+    The key covers normalized subject, body and sender plus the user
+    context, system prompt, model and temperature - everything that
+    shapes the GPT answer.
+    
+    Args:
+        email: Email data
+        context: User context (bookings, certificates)
+        system_prompt: System instructions for GPT
+        model: Model name
+        temperature: Temperature setting
+        
+    Returns:
+        32-byte BLAKE2b digest
+    """
+    sender = email.get('from') or {}
+    parts = [
+        ' '.join((email.get('subject') or '').split()),
+        ' '.join((email.get('bodyText') or '').split()),
+        (sender.get('email') or '').lower(),
+        sender.get('name') or '',
+        orjson.dumps(
+            [context.user_bookings, context.user_certificates],
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode(),
+        hashlib.sha256(system_prompt.encode()).hexdigest(),
+        model,
+        str(temperature)
+    ]
+    return hashlib.blake2b('\0'.join(parts).encode(), digest_size=32).digest()
+
+
+# Embedding input is capped well under the model's token limit
+SEMANTIC_CACHE_MAX_TEXT_CHARS = 8000
+
+
+def semantic_cache_namespace(email: Dict[str, Any], context: EmailContext) -> str:
+    """
+    Build the semantic cache namespace for an email.
+    
+    Namespacing by sender and user context means a cached answer is only
+    reused for the same person with the same bookings/certificates.
+    
+    Args:
+        email: Email data
+        context: User context (bookings, certificates)
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    signature = orjson.dumps(
+        [context.user_bookings, context.user_certificates],
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    ).decode()
+    sender = ((email.get('from') or {}).get('email') or '').lower()
+    return hashlib.sha256(f"{sender}\0{signature}".encode()).hexdigest()
+
+
+def semantic_cache_text(email: Dict[str, Any]) -> str:
+    """Build the text that is embedded for an email."""
+    text = f"{email.get('subject') or ''}\n{email.get('bodyText') or ''}"
+    return text[:SEMANTIC_CACHE_MAX_TEXT_CHARS]
+
+
+# Shared across requests and worker threads
+openai_rate_limiter = RateLimiter(
+    max_concurrent=OPENAI_MAX_CONCURRENT,
+    requests_per_minute=OPENAI_RPM_LIMIT,
+    tokens_per_minute=OPENAI_TPM_LIMIT
+)
+
+response_cache = ResponseCache(
+    db_pool,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+    local_size=RESPONSE_CACHE_LOCAL_SIZE,
+    local_ttl_seconds=RESPONSE_CACHE_LOCAL_TTL_SECONDS
+) if RESPONSE_CACHE_ENABLED else None
+
+semantic_cache = SemanticCache(
+    db_pool,
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    ttl_seconds=SEMANTIC_CACHE_TTL_SECONDS
+) if SEMANTIC_CACHE_ENABLED else None
+
+
 # ============================================================================
 # TEMPLATE ENGINE MODULE
 # ============================================================================
@@ -631,25 +1148,87 @@ This is an automated response. Our inbox is monitored and all emails are followe
         Returns:
             Rendered email body
         """
-        logger.info(f"Generating response from template: {template_id}")
+        logger.info("Generating response from template: %s", template_id)
         
-        template = TemplateEngine.TEMPLATES.get(template_id, '')
+        template = _COMPILED_TEMPLATES.get(template_id)
         
-        if not template:
-            logger.warning(f"Template not found: {template_id}")
+        if template is None:
+            logger.warning("Template not found: %s", template_id)
             return ""
         
-        # Simple variable substitution
-        response = template
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            response = response.replace(placeholder, str(value))
+        response = template.render(**variables)
         
-        logger.debug(f"Generated response length: {len(response)} chars")
+        logger.debug("Generated response length: %d chars", len(response))
         
         return response
 
 
+# Templates are compiled once; rendering is a single pass per response
+_TEMPLATE_ENV = Environment(autoescape=False, keep_trailing_newline=True)
+_COMPILED_TEMPLATES = {
+    template_id: _TEMPLATE_ENV.from_string(source)
+    for template_id, source in TemplateEngine.TEMPLATES.items()
+}
+
+
+# Template selection. Each builder maps (gpt_response, context) to
+# (template_id, variables); _TEMPLATE_DISPATCH picks the builder from the
+# decision's (action, category) buckets, see EmailProcessor._select_template.
+
+def _build_course_availability(gpt_response: GPTResponse, context: EmailContext) -> tuple:
+    """General availability reply."""
+    return 'course_availability', {'firstName': gpt_response.sender_first_name or 'there'}
+
+
+def _build_certificate_not_found(gpt_response: GPTResponse, context: EmailContext) -> tuple:
+    """Certificate enquiry with no matching certificate."""
+    return 'certificate_not_found', {'firstName': gpt_response.sender_first_name or 'there'}
+
+
+def _build_certificate_found(
+    gpt_response: GPTResponse,
+    context: EmailContext,
+    fallback
+) -> tuple:
+    """Certificate reply for the first certificate, else the fallback builder."""
+    if not context.user_certificates:
+        return fallback(gpt_response, context)
+    
+    cert = context.user_certificates[0]
+    return 'certificate_found', {
+        'firstName': gpt_response.sender_first_name or 'there',
+        'courseName': cert.get('course', 'Unknown Course'),
+        'courseDate': cert.get('date', 'Unknown Date')
+    }
+
+
+def _build_cancellation(gpt_response: GPTResponse, context: EmailContext) -> tuple:
+    """Cancellation reply for the first booking, else general availability."""
+    if not context.user_bookings:
+        return _build_course_availability(gpt_response, context)
+    
+    booking = context.user_bookings[0]
+    return 'cancellation_confirmed', {
+        'firstName': gpt_response.sender_first_name or 'there',
+        'courseName': booking.get('course', 'Unknown Course'),
+        'courseDate': booking.get('date', 'Unknown Date'),
+        'courseTime': booking.get('startTime', 'Unknown Time'),
+        'courseVenue': booking.get('venue', 'Unknown Venue')
+    }
+
+
+# (action bucket, category bucket) -> builder; anything else gets availability.
+# A certificate category outranks a cancel action, and a certificate action
+# without certificates falls back on the category.
+_TEMPLATE_DISPATCH = {
+    ('certificate', 'certificate'): partial(_build_certificate_found, fallback=_build_certificate_not_found),
+    ('certificate', '*'): partial(_build_certificate_found, fallback=_build_course_availability),
+    ('cancel', 'certificate'): _build_certificate_not_found,
+    ('*', 'certificate'): _build_certificate_not_found,
+    ('cancel', '*'): _build_cancellation
+}
+
+
 # ============================================================================
 # EMAIL PROCESSOR (Main Orchestrator)
 # ============================================================================
@@ -675,13 +1254,13 @@ class EmailProcessor:
             api_key=OPENAI_API_KEY,
             model=OPENAI_MODEL,
             temperature=OPENAI_TEMPERATURE,
-            max_tokens=OPENAI_MAX_TOKENS
+            max_tokens=OPENAI_MAX_TOKENS,
+            rate_limiter=openai_rate_limiter,
+            response_cache=response_cache,
+            semantic_cache=semantic_cache
         )
         self.template_engine = TemplateEngine()
         
-        # Load system prompt (in production, load from file)
-        self.system_prompt = self._load_system_prompt()
-        
         logger.info("EmailProcessor initialized")
     
     def process(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -694,42 +1273,38 @@ class EmailProcessor:
         Returns:
             API response dictionary
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         email_id = request_data.get('emailId', 'unknown')
         subject = request_data.get('subject', 'No subject')
         
-        logger.info("="*60)
-        logger.info(f"Processing email: {email_id}")
-        logger.info(f"Subject: {subject}")
-        logger.info("="*60)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=" * 60)
+            logger.info("Processing email: %s", email_id)
+            logger.info("Subject: %s", subject)
+            logger.info("=" * 60)
         
         reasoning_chain = []
-        record_id = None
+        record_pending = True  # no record queued for writing yet
+        steps = StepLogger()  # written with the final result in one transaction
         
         try:
-            # Create database record
-            record_id = email_db.create_email_record(
-                email_data=request_data,
-                context=request_data.get('context', {})
-            )
-            email_db.log_processing_step(
-                record_id, 'INFO', 'start', 
-                f'Processing email: {subject}'
-            )
+            normalized = NormalizedEmail.from_request(request_data)
             
-            # Step 1: Pre-filtering
-            filter_result = self.pre_filter.should_skip_gpt(request_data)
+            # Step 1: Pre-filtering runs before any database work; filtered
+            # emails are written by the background writer, off the request
+            filter_result = self.pre_filter.should_skip_gpt(normalized)
             reasoning_chain.append(f"Pre-filter: {filter_result.reason}")
-            email_db.log_processing_step(
-                record_id, 'INFO', 'pre_filter',
+            
+            steps.log('INFO', 'start', f'Processing email: {subject}')
+            steps.log(
+                'INFO', 'pre_filter',
                 f'Pre-filter result: {filter_result.reason}',
                 {'skip_gpt': filter_result.skip_gpt, 'confidence': filter_result.confidence}
             )
             
             if filter_result.skip_gpt:
-                logger.info(f"Email filtered: {filter_result.reason}")
+                logger.info("Email filtered: %s", filter_result.reason)
                 
-                # Update database with filter result
                 decision_dict = {
                     'shouldRespond': False,
                     'confidence': filter_result.confidence,
@@ -743,25 +1318,29 @@ class EmailProcessor:
                     }
                 }
                 
-                email_db.update_processing_result(
-                    record_id,
-                    decision_dict,
-                    time.time() - start_time,
+                email_db.queue_filtered_record(
+                    email_data=request_data,
+                    context=request_data.get('context', {}),
+                    decision=decision_dict,
+                    processing_time=time.perf_counter() - start_time,
                     pre_filter_reason=filter_result.reason,
-                    skipped_gpt=True
+                    steps=steps
                 )
+                record_pending = False
                 
                 return self._build_filtered_response(
                     filter_result, 
                     reasoning_chain,
-                    time.time() - start_time
+                    time.perf_counter() - start_time
                 )
             
+            # The record is written once the result is known (see below)
+            
             # Step 2: Sensitivity detection
-            sensitivity = self.sensitivity_detector.detect(request_data)
+            sensitivity = self.sensitivity_detector.detect(normalized)
             reasoning_chain.append(f"Sensitivity: {sensitivity.reasoning}")
-            email_db.log_processing_step(
-                record_id, 'INFO' if not sensitivity.flags else 'WARNING',
+            steps.log(
+                'INFO' if not sensitivity.flags else 'WARNING',
                 'sensitivity',
                 sensitivity.reasoning,
                 {'flags': sensitivity.flags, 'should_block': sensitivity.should_block}
@@ -785,7 +1364,7 @@ class EmailProcessor:
                 gpt_response = self.gpt_client.call_gpt(
                     email=request_data,
                     context=context,
-                    system_prompt=self.system_prompt
+                    system_prompt=SYSTEM_PROMPT
                 )
                 
                 if gpt_response:
@@ -793,8 +1372,8 @@ class EmailProcessor:
                         f"GPT: confidence={gpt_response.confidence:.2f}, "
                         f"action={gpt_response.action}"
                     )
-                    email_db.log_processing_step(
-                        record_id, 'INFO', 'gpt',
+                    steps.log(
+                        'INFO', 'gpt',
                         'GPT analysis complete',
                         {
                             'confidence': gpt_response.confidence,
@@ -804,14 +1383,14 @@ class EmailProcessor:
                     )
                 else:
                     reasoning_chain.append("GPT: API call failed")
-                    email_db.log_processing_step(
-                        record_id, 'ERROR', 'gpt',
+                    steps.log(
+                        'ERROR', 'gpt',
                         'GPT API call failed'
                     )
             else:
                 reasoning_chain.append("GPT: Skipped due to sensitivity flags")
-                email_db.log_processing_step(
-                    record_id, 'WARNING', 'gpt',
+                steps.log(
+                    'WARNING', 'gpt',
                     'GPT skipped due to sensitivity flags'
                 )
             
@@ -823,8 +1402,8 @@ class EmailProcessor:
                 reasoning_chain=reasoning_chain
             )
             
-            email_db.log_processing_step(
-                record_id, 'INFO', 'decision',
+            steps.log(
+                'INFO', 'decision',
                 f'Final decision: respond={decision.should_respond}, confidence={decision.confidence:.2f}',
                 {
                     'should_respond': decision.should_respond,
@@ -839,51 +1418,57 @@ class EmailProcessor:
                 gpt_response=gpt_response,
                 context=context,
                 reasoning_chain=reasoning_chain,
-                processing_time=time.time() - start_time
+                processing_time=time.perf_counter() - start_time
             )
             
-            # Update database with final result
-            decision_dict = asdict(decision)
+            # Queue the record with its result, response and steps in one write
+            decision_dict = decision.to_dict()
             decision_dict['humanReview'] = api_response.human_review
             
-            email_db.update_processing_result(
-                record_id,
-                decision_dict,
-                api_response.processing_time,
-                gpt_tokens=gpt_tokens
+            email_db.create_and_finalize_record(
+                email_data=request_data,
+                context=request_data.get('context', {}),
+                decision=decision_dict,
+                processing_time=api_response.processing_time,
+                steps=steps,
+                gpt_tokens=gpt_tokens,
+                response_data=api_response.response,
+                actions=api_response.actions
             )
-            
-            # Save response if generated
-            if api_response.response:
-                email_db.save_response(
-                    record_id,
-                    api_response.response,
-                    api_response.actions
-                )
+            record_pending = False
             
             logger.info(
-                f"Processing complete: confidence={decision.confidence:.2f}, "
-                f"action={decision.action}, time={api_response.processing_time:.2f}s"
+                "Processing complete: confidence=%.2f, action=%s, time=%.2fs",
+                decision.confidence, decision.action, api_response.processing_time
             )
             
-            return asdict(api_response)
+            return api_response.to_dict()
             
         except Exception as e:
-            logger.error(f"Error processing email: {e}")
+            logger.error("Error processing email: %s", e)
             logger.error(traceback.format_exc())
             
-            # Log error to database
-            if record_id:
-                email_db.log_error(record_id, str(e))
-                email_db.log_processing_step(
-                    record_id, 'ERROR', 'exception',
-                    f'Processing failed: {str(e)}'
-                )
+            # Log error to database, creating the record since the
+            # combined write above never ran
+            if record_pending:
+                try:
+                    steps.log(
+                        'ERROR', 'exception',
+                        f'Processing failed: {str(e)}'
+                    )
+                    email_db.create_error_record(
+                        email_data=request_data,
+                        context=request_data.get('context', {}),
+                        error_message=str(e),
+                        steps=steps
+                    )
+                except Exception as db_error:
+                    logger.error("Failed to record processing error: %s", db_error)
             
             return self._build_error_response(
                 error_msg=str(e),
                 reasoning_chain=reasoning_chain,
-                processing_time=time.time() - start_time
+                processing_time=time.perf_counter() - start_time
             )
     
     def _make_decision(
@@ -938,8 +1523,8 @@ class EmailProcessor:
         # Block certain actions if sensitivity detected
         if sensitivity.flags and action != "none":
             logger.warning(
-                f"Blocking action '{action}' due to sensitivity flags: "
-                f"{sensitivity.flags}"
+                "Blocking action '%s' due to sensitivity flags: %s",
+                action, sensitivity.flags
             )
             action = "none"
             reasoning_chain.append("Action blocked due to sensitivity")
@@ -950,8 +1535,8 @@ class EmailProcessor:
             category = gpt_response.enquiry_type
         
         logger.info(
-            f"Decision: respond={should_respond}, confidence={confidence:.2f}, "
-            f"action={action}"
+            "Decision: respond=%s, confidence=%.2f, action=%s",
+            should_respond, confidence, action
         )
         
         return ProcessingDecision(
@@ -1050,7 +1635,7 @@ class EmailProcessor:
             'apiVersion': '2.0',
             'processingNode': os.getenv('HOSTNAME', 'unknown'),
             'gptTokensUsed': 0,  # Would track from GPT response
-            'cacheHit': False
+            'cacheHit': bool(gpt_response and gpt_response.cache_hit)
         }
         
         return APIResponse(
@@ -1080,38 +1665,18 @@ class EmailProcessor:
         Returns:
             Tuple of (template_id, variables_dict)
         """
-        # Default variables
-        variables = {
-            'firstName': gpt_response.sender_first_name or 'there'
-        }
-        
-        # Certificate request
-        if 'certificate' in decision.action and context.user_certificates:
-            cert = context.user_certificates[0]
-            template_id = 'certificate_found'
-            variables.update({
-                'courseName': cert.get('course', 'Unknown Course'),
-                'courseDate': cert.get('date', 'Unknown Date')
-            })
-        elif 'certificate' in decision.category:
-            template_id = 'certificate_not_found'
-        
-        # Cancellation
-        elif decision.action == 'cancel' and context.user_bookings:
-            booking = context.user_bookings[0]
-            template_id = 'cancellation_confirmed'
-            variables.update({
-                'courseName': booking.get('course', 'Unknown Course'),
-                'courseDate': booking.get('date', 'Unknown Date'),
-                'courseTime': booking.get('startTime', 'Unknown Time'),
-                'courseVenue': booking.get('venue', 'Unknown Venue')
-            })
-        
-        # General availability
+        if 'certificate' in decision.action:
+            action_key = 'certificate'
+        elif decision.action == 'cancel':
+            action_key = 'cancel'
         else:
-            template_id = 'course_availability'
+            action_key = '*'
+        category_key = 'certificate' if 'certificate' in decision.category else '*'
         
-        logger.info(f"Selected template: {template_id}")
+        builder = _TEMPLATE_DISPATCH.get((action_key, category_key), _build_course_availability)
+        template_id, variables = builder(gpt_response, context)
+        
+        logger.info("Selected template: %s", template_id)
         
         return template_id, variables
     
@@ -1149,7 +1714,7 @@ class EmailProcessor:
             }
         )
         
-        return asdict(response)
+        return response.to_dict()
     
     def _build_error_response(
         self,
@@ -1178,30 +1743,16 @@ class EmailProcessor:
                 'processingTime': processing_time
             }
         }
-    
-    def _load_system_prompt(self) -> str:
-        """Load GPT system prompt (simplified version)."""
-        # In production, load from file
-        # For now, return inline version
-        return """
-You are REdI-AI, an automated email assistant for the Resuscitation Education Initiative.
 
-Analyze emails and respond with JSON containing:
-- is_new_email: boolean
-- sender_first_name: string
-- enquiry_type: string (1-3 words)
-- recommended_response: string
-- confidence: number (0-1)
-- action: "send_certificate" | "cancel" | "none"
 
-Confidence scoring:
-- 0.1-0.2: System messages, complaints, urgent matters
-- 0.5-0.7: General enquiries, needs clarification
-- 0.8-0.95: Clear actionable requests
+# Created once per worker; the processor holds no per-request state, so all
+# request threads share its GPT client and connection pool
+email_processor = EmailProcessor()
 
-NEVER respond to: complaints, escalations, HR issues, negative sentiment.
-Always include booking app link: https://tinyurl.com/bookREdIALS
-"""
+# Warm the OpenAI connection in the background so worker startup isn't delayed
+threading.Thread(
+    target=email_processor.gpt_client.warm_up, name='openai-warm-up', daemon=True
+).start()
 
 
 # ============================================================================
@@ -1219,6 +1770,38 @@ def health_check():
     })
 
 
+# Readiness probes share one cached database check so frequent probing
+# does not take pool connections away from email processing
+READY_PROBE_INTERVAL_SECONDS = 5.0
+_ready_lock = threading.Lock()
+_ready_checked_at = None
+_ready_ok = False
+
+
+def database_ready() -> bool:
+    """
+    Report database readiness, probing at most once per interval.
+    
+    Returns:
+        Result of the most recent SELECT 1 probe
+    """
+    global _ready_checked_at, _ready_ok
+    with _ready_lock:
+        now = time.monotonic()
+        if _ready_checked_at is None or now - _ready_checked_at >= READY_PROBE_INTERVAL_SECONDS:
+            _ready_ok = db_pool.ping()
+            _ready_checked_at = now
+        return _ready_ok
+
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check endpoint (verifies the database pool)."""
+    if database_ready():
+        return jsonify({'status': 'ready', 'database': 'connected'})
+    return jsonify({'status': 'not ready', 'database': 'unavailable'}), 503
+
+
 @app.route('/api/statistics', methods=['GET'])
 @require_api_key
 def get_statistics():
@@ -1227,10 +1810,12 @@ def get_statistics():
     
     Query Parameters:
         days: Number of days to include (default: 30)
+        fresh: Set to 1 to bypass the 60 second statistics cache
     """
     try:
         days = int(request.args.get('days', 30))
-        stats = email_db.get_statistics(days=days)
+        fresh = request.args.get('fresh') == '1'
+        stats = email_db.get_statistics(days=days, fresh=fresh)
         
         return jsonify({
             'success': True,
@@ -1238,7 +1823,7 @@ def get_statistics():
         })
         
     except Exception as e:
-        logger.error(f"Statistics endpoint error: {e}")
+        logger.error("Statistics endpoint error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1265,7 +1850,7 @@ def get_recent_emails():
         })
         
     except Exception as e:
-        logger.error(f"Recent emails endpoint error: {e}")
+        logger.error("Recent emails endpoint error: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1293,13 +1878,12 @@ def process_email():
             }), 400
         
         # Process email
-        processor = EmailProcessor()
-        result = processor.process(request_data)
+        result = email_processor.process(request_data)
         
         return jsonify(result)
         
     except Exception as e:
-        logger.error(f"Endpoint error: {e}")
+        logger.error("Endpoint error: %s", e)
         logger.error(traceback.format_exc())
         
         return jsonify({
@@ -1317,10 +1901,10 @@ def process_email():
 
 if __name__ == '__main__':
     logger.info("Starting REdI Email Processing API Server...")
-    logger.info(f"Model: {OPENAI_MODEL}")
-    logger.info(f"Confidence thresholds: High={CONFIDENCE_THRESHOLD_HIGH}, "
-                f"Moderate={CONFIDENCE_THRESHOLD_MODERATE}, "
-                f"Low={CONFIDENCE_THRESHOLD_LOW}")
+    logger.info("Model: %s", OPENAI_MODEL)
+    logger.info("Confidence thresholds: High=%s, Moderate=%s, Low=%s",
+                CONFIDENCE_THRESHOLD_HIGH, CONFIDENCE_THRESHOLD_MODERATE,
+                CONFIDENCE_THRESHOLD_LOW)
     
     app.run(
         host='0.0.0.0',
@@ -8,15 +8,22 @@ Author: Sean Wing
 Date: 2026-01-02
 """
 
+import io
 import os
+import time
+import atexit
+import queue
 import logging
-from datetime import datetime
+import threading
+import weakref
+from dataclasses import dataclass
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-import json
 
-import psycopg2
+import orjson
 from psycopg2.extras import RealDictCursor, Json
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -26,14 +33,178 @@ logger = logging.getLogger(__name__)
 # DATABASE CONNECTION POOL
 # ============================================================================
 
+# Hot statements, prepared once per pooled connection so Postgres skips
+# parsing and planning on every call. Run with EXECUTE name (...).
+PREPARED_STATEMENTS = {
+    # A record whose processing result is already known: EmailPayload.as_row()
+    # followed by the result columns; runs once for every processed email
+    'insert_complete_record': """
+        INSERT INTO email_records (
+            email_id,
+            conversation_id,
+            received_datetime,
+            sender_name,
+            sender_email,
+            subject,
+            body_preview,
+            body_text,
+            body_html,
+            user_bookings_count,
+            user_certificates_count,
+            category,
+            confidence,
+            action,
+            should_respond,
+            sensitivity_flags,
+            pre_filter_reason,
+            skipped_gpt,
+            processing_time_seconds,
+            gpt_tokens_used,
+            human_review_required,
+            human_review_priority,
+            human_review_reason,
+            api_version
+        ) VALUES (
+            $1,
+            $2,
+            $3,
+            $4,
+            $5,
+            $6,
+            $7,
+            $8,
+            $9,
+            $10,
+            $11,
+            $12,
+            $13,
+            $14,
+            $15,
+            $16,
+            $17,
+            $18,
+            $19,
+            $20,
+            $21,
+            $22,
+            $23,
+            '2.0'
+        )
+        ON CONFLICT (email_id) DO UPDATE SET
+            received_datetime = EXCLUDED.received_datetime,
+            category = EXCLUDED.category,
+            confidence = EXCLUDED.confidence,
+            action = EXCLUDED.action,
+            should_respond = EXCLUDED.should_respond,
+            sensitivity_flags = EXCLUDED.sensitivity_flags,
+            pre_filter_reason = EXCLUDED.pre_filter_reason,
+            skipped_gpt = EXCLUDED.skipped_gpt,
+            processing_time_seconds = EXCLUDED.processing_time_seconds,
+            gpt_tokens_used = EXCLUDED.gpt_tokens_used,
+            human_review_required = EXCLUDED.human_review_required,
+            human_review_priority = EXCLUDED.human_review_priority,
+            human_review_reason = EXCLUDED.human_review_reason,
+            processing_error = FALSE,
+            error_message = NULL
+        RETURNING id::text, xmax <> 0 AS redelivered
+    """,
+    'upsert_response': """
+        INSERT INTO email_responses (
+            email_record_id,
+            subject,
+            body_html,
+            template_id,
+            template_variables,
+            actions_performed
+        ) VALUES ($1::uuid, $2, $3, $4, $5, $6)
+        ON CONFLICT (email_record_id) DO UPDATE SET
+            subject = EXCLUDED.subject,
+            body_html = EXCLUDED.body_html,
+            template_id = EXCLUDED.template_id,
+            template_variables = EXCLUDED.template_variables,
+            actions_performed = EXCLUDED.actions_performed
+    """,
+    'mark_error': """
+        UPDATE email_records SET
+            processing_error = TRUE,
+            error_message = $2
+        WHERE id = $1::uuid
+    """,
+    # One scan yields the overall row (GROUPING = 1) and one row per category
+    'statistics': """
+        SELECT 
+            category,
+            COUNT(*) as total_emails,
+            COUNT(*) FILTER (WHERE should_respond = TRUE) as responses_sent,
+            COUNT(*) FILTER (WHERE skipped_gpt = TRUE) as pre_filtered,
+            COUNT(*) FILTER (WHERE human_review_required = TRUE) as human_reviews,
+            AVG(confidence) as avg_confidence,
+            AVG(processing_time_seconds) as avg_processing_time,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY processing_time_seconds)
+                as p95_processing_time,
+            SUM(gpt_tokens_used) as total_gpt_tokens
+        FROM email_records
+        WHERE received_datetime >= NOW() - make_interval(days => $1)
+        GROUP BY GROUPING SETS ((), (category))
+        ORDER BY GROUPING(category) DESC, COUNT(*) DESC
+    """
+}
+
+# The only statements a read-only pool prepares; the rest write
+READ_ONLY_STATEMENTS = ('statistics',)
+
+
+# Processing steps are written in bulk with COPY (text format)
+COPY_STEPS_SQL = """
+    COPY processing_logs (
+        email_record_id,
+        log_level,
+        step,
+        message,
+        metadata,
+        created_at
+    ) FROM STDIN
+"""
+
+# A new email_records row from EmailPayload.as_row(); a redelivered
+# email_id reuses its existing row
+INSERT_EMAIL_RECORD_SQL = """
+    INSERT INTO email_records (
+        email_id,
+        conversation_id,
+        received_datetime,
+        sender_name,
+        sender_email,
+        subject,
+        body_preview,
+        body_text,
+        body_html,
+        user_bookings_count,
+        user_certificates_count
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (email_id) DO UPDATE SET
+        received_datetime = EXCLUDED.received_datetime
+    RETURNING id::text
+"""
+
+
 class DatabasePool:
     """
     PostgreSQL connection pool for efficient database operations.
     
     Uses connection pooling to avoid creating new connections for each request.
+    The pool is thread-safe so it can be shared by gunicorn worker threads.
     """
     
-    def __init__(self, database_url: str, min_conn: int = 1, max_conn: int = 10):
+    ACQUIRE_TIMEOUT_SECONDS = 30
+    
+    def __init__(
+        self,
+        database_url: str,
+        min_conn: int = 1,
+        max_conn: int = 10,
+        read_only: bool = False
+    ):
         """
         Initialize database connection pool.
         
@@ -41,60 +212,114 @@ class DatabasePool:
             database_url: PostgreSQL connection string
             min_conn: Minimum number of connections
             max_conn: Maximum number of connections
+            read_only: Open connections with default_transaction_read_only
         """
         self.database_url = database_url
+        self.read_only = read_only
         self.pool = None
+        self._prepared = weakref.WeakSet()  # connections with PREPARED_STATEMENTS
+        # psycopg2 raises PoolError when every connection is in use; make
+        # callers wait for one instead so a small pool queues bursts
+        self._available = threading.BoundedSemaphore(max_conn)
         
         try:
-            self.pool = SimpleConnectionPool(
+            options = {'options': '-c default_transaction_read_only=on'} if read_only else {}
+            self.pool = ThreadedConnectionPool(
                 min_conn,
                 max_conn,
-                database_url
+                database_url,
+                **options
+            )
+            logger.info(
+                "Database pool initialized: %s-%s connections%s",
+                min_conn, max_conn, ' (read-only)' if read_only else ''
             )
-            logger.info(f"Database pool initialized: {min_conn}-{max_conn} connections")
             
         except Exception as e:
-            logger.error(f"Failed to initialize database pool: {e}")
+            logger.error("Failed to initialize database pool: %s", e)
             raise
     
     @contextmanager
     def get_connection(self):
         """
-        Get a connection from the pool.
+        Get a connection from the pool, waiting if all are in use.
         
         Yields:
             Database connection
         """
-        conn = self.pool.getconn()
+        if not self._available.acquire(timeout=self.ACQUIRE_TIMEOUT_SECONDS):
+            raise PoolError(
+                f"No database connection available after {self.ACQUIRE_TIMEOUT_SECONDS}s"
+            )
         try:
-            yield conn
+            conn = self.pool.getconn()
+            try:
+                if conn not in self._prepared:
+                    self._prepare(conn)
+                yield conn
+            finally:
+                self.pool.putconn(conn)
         finally:
-            self.pool.putconn(conn)
+            self._available.release()
+    
+    def _prepare(self, conn):
+        """Prepare PREPARED_STATEMENTS on a newly seen connection."""
+        try:
+            with conn.cursor() as cursor:
+                for name, sql in PREPARED_STATEMENTS.items():
+                    if self.read_only and name not in READ_ONLY_STATEMENTS:
+                        continue
+                    cursor.execute(f"PREPARE {name} AS {sql}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self._prepared.add(conn)
     
     @contextmanager
-    def get_cursor(self, commit: bool = True):
+    def get_cursor(self, commit: bool = True, cursor_factory=None):
         """
         Get a cursor from the pool with automatic commit/rollback.
         
+        Rows come back as plain tuples unless a cursor_factory is given;
+        pass RealDictCursor where callers need rows keyed by column name.
+        
         Args:
             commit: Whether to auto-commit on success
+            cursor_factory: Optional psycopg2 cursor class for the cursor
             
         Yields:
             Database cursor
         """
         with self.get_connection() as conn:
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor = conn.cursor(cursor_factory=cursor_factory)
             try:
                 yield cursor
                 if commit:
                     conn.commit()
             except Exception as e:
                 conn.rollback()
-                logger.error(f"Database error: {e}")
+                logger.error("Database error: %s", e)
                 raise
             finally:
                 cursor.close()
     
+    def ping(self) -> bool:
+        """
+        Check that a pooled connection can run a trivial query.
+        
+        Returns:
+            True if SELECT 1 succeeded
+        """
+        try:
+            with self.get_cursor(commit=False) as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return True
+        except Exception as e:
+            logger.warning("Database ping failed: %s", e)
+            return False
+    
     def close(self):
         """Close all connections in the pool."""
         if self.pool:
@@ -102,10 +327,243 @@ class DatabasePool:
             logger.info("Database pool closed")
 
 
+# ============================================================================
+# BACKGROUND WRITER
+# ============================================================================
+
+class DBWriter:
+    """
+    Background thread that performs queued database writes.
+    
+    Jobs are callables taking an open cursor. The thread collects up to
+    BATCH_SIZE jobs, waiting at most FLUSH_INTERVAL seconds after the
+    first, and runs them in one transaction. If a batch fails, each job is
+    retried in its own transaction so one bad row does not drop the others.
+    
+    A job may return processing_logs rows in COPY text format; the rows
+    from every job in a batch are written with a single COPY at the end.
+    """
+    
+    BATCH_SIZE = 100
+    FLUSH_INTERVAL = 0.05
+    
+    def __init__(self, pool: DatabasePool, max_queue: int = 10000):
+        """
+        Initialize and start the writer thread.
+        
+        Args:
+            pool: Database connection pool
+            max_queue: Maximum queued jobs before writes become synchronous
+        """
+        self.pool = pool
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        
+        logger.info("DB writer started: max_queue=%s", max_queue)
+    
+    def submit(self, job, *args):
+        """
+        Queue a write job.
+        
+        Args:
+            job: Callable invoked as job(cursor, *args)
+            *args: Arguments for the job
+        """
+        try:
+            self._queue.put_nowait((job, args))
+        except queue.Full:
+            logger.warning("DB writer queue full - writing synchronously")
+            self._execute([(job, args)])
+    
+    def stop(self, timeout: float = 5.0):
+        """Write any queued jobs and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+    
+    def _run(self):
+        """Drain the queue in batches until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._execute(batch)
+            if stopping:
+                return
+    
+    def _execute(self, batch: List[tuple]):
+        """Run a batch of jobs in one transaction, falling back to one per job."""
+        try:
+            self._run_jobs(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("Background write failed: %s", e)
+                return
+            logger.warning("Batched write failed, retrying individually: %s", e)
+        
+        for item in batch:
+            try:
+                self._run_jobs([item])
+            except Exception as e:
+                logger.error("Background write failed: %s", e)
+    
+    def _run_jobs(self, batch: List[tuple]):
+        """Run jobs in one transaction, then COPY the step rows they returned."""
+        with self.pool.get_cursor() as cursor:
+            buffer = io.StringIO()
+            for job, args in batch:
+                rows = job(cursor, *args)
+                if rows:
+                    buffer.write(rows)
+            
+            if buffer.tell():
+                buffer.seek(0)
+                cursor.copy_expert(COPY_STEPS_SQL, buffer)
+
+
 # ============================================================================
 # DATABASE OPERATIONS
 # ============================================================================
 
+def _dumps_json(obj: Any) -> str:
+    """Serialize a value for a JSON/JSONB column with orjson."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class OJson(Json):
+    """psycopg2 Json adapter that encodes with orjson instead of json.dumps."""
+    
+    def dumps(self, obj):
+        return _dumps_json(obj)
+
+
+def _copy_text(value: Optional[str]) -> str:
+    """Escape a value for the COPY text format (None becomes NULL)."""
+    if value is None:
+        return '\\N'
+    return (
+        value.replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class EmailPayload:
+    """Email columns of a record, extracted once from the request payload"""
+    email_id: str
+    conversation_id: Optional[str]
+    received_datetime: Optional[str]
+    sender_name: Optional[str]
+    sender_email: str
+    subject: Optional[str]
+    body_preview: Optional[str]
+    body_text: Optional[str]
+    body_html: Optional[str]
+    user_bookings_count: int
+    user_certificates_count: int
+    
+    @classmethod
+    def from_request(cls, email_data: Dict[str, Any], context: Dict[str, Any]) -> 'EmailPayload':
+        """
+        Extract the email columns of a record from a request.
+        
+        Args:
+            email_data: Email data from request
+            context: User context (bookings, certificates)
+            
+        Returns:
+            EmailPayload for the request
+        """
+        sender = email_data.get('from') or {}
+        if 'receivedDateTime' in email_data:
+            received_datetime = email_data['receivedDateTime']
+        else:
+            received_datetime = datetime.utcnow().isoformat()
+        
+        return cls(
+            email_id=email_data.get('emailId', 'unknown'),
+            conversation_id=email_data.get('conversationId'),
+            received_datetime=received_datetime,
+            sender_name=sender.get('name'),
+            sender_email=sender.get('email', 'unknown'),
+            subject=email_data.get('subject'),
+            body_preview=email_data.get('bodyPreview'),
+            body_text=email_data.get('bodyText'),
+            body_html=email_data.get('bodyHtml'),
+            user_bookings_count=len(context.get('userBookings', [])),
+            user_certificates_count=len(context.get('userCertificates', []))
+        )
+    
+    def as_row(self) -> tuple:
+        """Return the columns in INSERT_EMAIL_RECORD_SQL order."""
+        return (
+            self.email_id,
+            self.conversation_id,
+            self.received_datetime,
+            self.sender_name,
+            self.sender_email,
+            self.subject,
+            self.body_preview,
+            self.body_text,
+            self.body_html,
+            self.user_bookings_count,
+            self.user_certificates_count
+        )
+
+
+class StepLogger:
+    """
+    In-memory buffer of processing steps for one email.
+    
+    Steps are timestamped when logged and written in a single statement
+    alongside the record's result, instead of one transaction per step.
+    """
+    
+    def __init__(self):
+        """Initialize an empty step buffer."""
+        self.steps: List[tuple] = []
+    
+    def log(
+        self,
+        level: str,
+        step: str,
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Buffer a processing step.
+        
+        Args:
+            level: Log level (INFO, WARNING, ERROR)
+            step: Processing step name
+            message: Log message
+            metadata: Additional metadata
+        """
+        self.steps.append((level, step, message, metadata, datetime.now(timezone.utc)))
+
+
 class EmailDatabase:
     """
     Database operations for email processing records.
@@ -117,14 +575,22 @@ class EmailDatabase:
     - Query statistics
     """
     
-    def __init__(self, pool: DatabasePool):
+    STATS_CACHE_TTL_SECONDS = 60
+    STATS_CACHE_SIZE = 32
+    
+    def __init__(self, pool: DatabasePool, read_pool: Optional[DatabasePool] = None):
         """
         Initialize database operations.
         
         Args:
             pool: Database connection pool
+            read_pool: Read-only pool for dashboard queries (defaults to pool)
         """
         self.pool = pool
+        self.read_pool = read_pool or pool
+        self.writer = DBWriter(pool)
+        self._stats_cache = OrderedDict()  # days -> (expires_at, statistics)
+        self._stats_lock = threading.Lock()
         logger.info("EmailDatabase initialized")
     
     def create_email_record(
@@ -144,55 +610,179 @@ class EmailDatabase:
         """
         try:
             with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO email_records (
-                        email_id,
-                        conversation_id,
-                        received_datetime,
-                        sender_name,
-                        sender_email,
-                        subject,
-                        body_preview,
-                        body_text,
-                        body_html,
-                        user_bookings_count,
-                        user_certificates_count
-                    ) VALUES (
-                        %(email_id)s,
-                        %(conversation_id)s,
-                        %(received_datetime)s,
-                        %(sender_name)s,
-                        %(sender_email)s,
-                        %(subject)s,
-                        %(body_preview)s,
-                        %(body_text)s,
-                        %(body_html)s,
-                        %(user_bookings_count)s,
-                        %(user_certificates_count)s
-                    )
-                    RETURNING id::text
-                """, {
-                    'email_id': email_data.get('emailId', 'unknown'),
-                    'conversation_id': email_data.get('conversationId'),
-                    'received_datetime': email_data.get('receivedDateTime', datetime.utcnow().isoformat()),
-                    'sender_name': email_data.get('from', {}).get('name'),
-                    'sender_email': email_data.get('from', {}).get('email', 'unknown'),
-                    'subject': email_data.get('subject'),
-                    'body_preview': email_data.get('bodyPreview'),
-                    'body_text': email_data.get('bodyText'),
-                    'body_html': email_data.get('bodyHtml'),
-                    'user_bookings_count': len(context.get('userBookings', [])),
-                    'user_certificates_count': len(context.get('userCertificates', []))
-                })
-                
-                record_id = cursor.fetchone()['id']
-                logger.info(f"Created email record: {record_id}")
-                return record_id
-                
+                record_id = self._insert_email_record(
+                    cursor, EmailPayload.from_request(email_data, context)
+                )
+            logger.info("Created email record: %s", record_id)
+            return record_id
+            
         except Exception as e:
-            logger.error(f"Failed to create email record: {e}")
+            logger.error("Failed to create email record: %s", e)
             raise
     
+    @staticmethod
+    def _insert_email_record(cursor, payload: EmailPayload) -> str:
+        """
+        Insert an email record using an open cursor and return its id.
+        
+        A redelivered email_id reuses its existing row instead of failing
+        on the unique constraint.
+        """
+        cursor.execute(INSERT_EMAIL_RECORD_SQL, payload.as_row())
+        return cursor.fetchone()[0]
+    
+    def queue_filtered_record(
+        self,
+        email_data: Dict[str, Any],
+        context: Dict[str, Any],
+        decision: Dict[str, Any],
+        processing_time: float,
+        pre_filter_reason: str,
+        steps: 'StepLogger'
+    ):
+        """
+        Queue a complete record for a pre-filtered email on the background writer.
+        
+        Pre-filtered emails never reach GPT, so the final result is known
+        before anything is written and nothing in the API response depends
+        on the record.
+        
+        Args:
+            email_data: Email data from request
+            context: User context (bookings, certificates)
+            decision: Processing decision dictionary
+            processing_time: Time taken to process (seconds)
+            pre_filter_reason: Reason the email was pre-filtered
+            steps: Buffered processing steps
+        """
+        self.create_and_finalize_record(
+            email_data, context, decision, processing_time, steps,
+            pre_filter_reason=pre_filter_reason,
+            skipped_gpt=True
+        )
+    
+    def create_and_finalize_record(
+        self,
+        email_data: Dict[str, Any],
+        context: Dict[str, Any],
+        decision: Dict[str, Any],
+        processing_time: float,
+        steps: 'StepLogger',
+        gpt_tokens: int = 0,
+        response_data: Optional[Dict[str, Any]] = None,
+        actions: Optional[List[Dict[str, Any]]] = None,
+        pre_filter_reason: Optional[str] = None,
+        skipped_gpt: bool = False
+    ):
+        """
+        Queue a record whose result is already known on the background writer.
+        
+        The row is inserted with its result columns already set, together
+        with its response and processing steps, in one transaction off the
+        request thread - one INSERT instead of an INSERT and a later UPDATE.
+        
+        Args:
+            email_data: Email data from request
+            context: User context (bookings, certificates)
+            decision: Processing decision dictionary
+            processing_time: Time taken to process (seconds)
+            steps: Buffered processing steps
+            gpt_tokens: Number of GPT tokens used
+            response_data: Response content and metadata, if generated
+            actions: List of actions to be performed
+            pre_filter_reason: Reason if pre-filtered
+            skipped_gpt: Whether GPT was skipped
+        """
+        human_review = decision.get('humanReview', {})
+        params = EmailPayload.from_request(email_data, context).as_row() + (
+            decision.get('category'),
+            decision.get('confidence'),
+            decision.get('action'),
+            decision.get('shouldRespond', False),
+            decision.get('sensitivityFlags', []),
+            pre_filter_reason,
+            skipped_gpt,
+            processing_time,
+            gpt_tokens,
+            human_review.get('required', False),
+            human_review.get('priority'),
+            human_review.get('reason')
+        )
+        
+        self.writer.submit(self._insert_complete_record, params, steps, response_data, actions)
+    
+    @classmethod
+    def _insert_complete_record(
+        cls,
+        cursor,
+        params: tuple,
+        steps: 'StepLogger',
+        response_data: Optional[Dict[str, Any]],
+        actions: Optional[List[Dict[str, Any]]]
+    ):
+        """
+        Insert a finished record, its response and its steps using an open cursor.
+        
+        A redelivered email_id overwrites the earlier row's result columns,
+        clears any error from a failed attempt and drops a response that
+        this attempt did not produce.
+        """
+        cursor.execute(
+            "EXECUTE insert_complete_record ("
+            "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, "
+            "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            params
+        )
+        
+        # xmax is only set on the existing row an ON CONFLICT update touched
+        record_id, redelivered = cursor.fetchone()
+        if response_data:
+            cls._insert_response(cursor, record_id, response_data, actions or [])
+        elif redelivered:
+            cursor.execute(
+                "DELETE FROM email_responses WHERE email_record_id = %s::uuid",
+                (record_id,)
+            )
+        logger.info("Created finished email record: %s", record_id)
+        return cls._step_rows(cursor, record_id, steps)
+    
+    def create_error_record(
+        self,
+        email_data: Dict[str, Any],
+        context: Dict[str, Any],
+        error_message: str,
+        steps: 'StepLogger'
+    ):
+        """
+        Queue a record for an email whose processing failed.
+        
+        The insert, the error mark and the processing steps are written in
+        one transaction on the background writer instead of a synchronous
+        insert followed by separately queued writes.
+        
+        Args:
+            email_data: Email data from request
+            context: User context (bookings, certificates)
+            error_message: Error message
+            steps: Buffered processing steps
+        """
+        payload = EmailPayload.from_request(email_data, context)
+        self.writer.submit(self._insert_error_record, payload, error_message, steps)
+    
+    @classmethod
+    def _insert_error_record(
+        cls,
+        cursor,
+        payload: EmailPayload,
+        error_message: str,
+        steps: 'StepLogger'
+    ):
+        """Insert a failed record, mark its error and return its steps using an open cursor."""
+        record_id = cls._insert_email_record(cursor, payload)
+        cls._mark_error(cursor, record_id, error_message)
+        logger.warning("Logged error for record %s: %s", record_id, error_message)
+        return cls._step_rows(cursor, record_id, steps)
+    
     def update_processing_result(
         self,
         record_id: str,
@@ -203,7 +793,7 @@ class EmailDatabase:
         skipped_gpt: bool = False
     ):
         """
-        Update email record with processing results.
+        Queue an update of an email record's processing results.
         
         Args:
             record_id: UUID of email record
@@ -213,45 +803,10 @@ class EmailDatabase:
             pre_filter_reason: Reason if pre-filtered
             skipped_gpt: Whether GPT was skipped
         """
-        try:
-            with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    UPDATE email_records SET
-                        category = %(category)s,
-                        confidence = %(confidence)s,
-                        action = %(action)s,
-                        should_respond = %(should_respond)s,
-                        sensitivity_flags = %(sensitivity_flags)s,
-                        pre_filter_reason = %(pre_filter_reason)s,
-                        skipped_gpt = %(skipped_gpt)s,
-                        processing_time_seconds = %(processing_time)s,
-                        gpt_tokens_used = %(gpt_tokens)s,
-                        human_review_required = %(human_review_required)s,
-                        human_review_priority = %(human_review_priority)s,
-                        human_review_reason = %(human_review_reason)s,
-                        api_version = '2.0'
-                    WHERE id = %(record_id)s::uuid
-                """, {
-                    'record_id': record_id,
-                    'category': decision.get('category'),
-                    'confidence': decision.get('confidence'),
-                    'action': decision.get('action'),
-                    'should_respond': decision.get('shouldRespond', False),
-                    'sensitivity_flags': decision.get('sensitivityFlags', []),
-                    'pre_filter_reason': pre_filter_reason,
-                    'skipped_gpt': skipped_gpt,
-                    'processing_time': processing_time,
-                    'gpt_tokens': gpt_tokens,
-                    'human_review_required': decision.get('humanReview', {}).get('required', False),
-                    'human_review_priority': decision.get('humanReview', {}).get('priority'),
-                    'human_review_reason': decision.get('humanReview', {}).get('reason')
-                })
-                
-                logger.info(f"Updated processing result for record: {record_id}")
-                
-        except Exception as e:
-            logger.error(f"Failed to update processing result: {e}")
-            # Don't raise - we don't want DB errors to break the API response
+        self.writer.submit(
+            self._update_result, record_id, decision, processing_time,
+            gpt_tokens, pre_filter_reason, skipped_gpt
+        )
     
     def save_response(
         self,
@@ -260,51 +815,96 @@ class EmailDatabase:
         actions: List[Dict[str, Any]]
     ):
         """
-        Save email response details.
+        Queue saving an email response's details.
         
         Args:
             record_id: UUID of email record
             response_data: Response content and metadata
             actions: List of actions to be performed
         """
-        try:
-            with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO email_responses (
-                        email_record_id,
-                        subject,
-                        body_html,
-                        template_id,
-                        template_variables,
-                        actions_performed
-                    ) VALUES (
-                        %(record_id)s::uuid,
-                        %(subject)s,
-                        %(body_html)s,
-                        %(template_id)s,
-                        %(template_variables)s,
-                        %(actions_performed)s
-                    )
-                    ON CONFLICT (email_record_id) DO UPDATE SET
-                        subject = EXCLUDED.subject,
-                        body_html = EXCLUDED.body_html,
-                        template_id = EXCLUDED.template_id,
-                        template_variables = EXCLUDED.template_variables,
-                        actions_performed = EXCLUDED.actions_performed
-                """, {
-                    'record_id': record_id,
-                    'subject': response_data.get('subject'),
-                    'body_html': response_data.get('bodyHtml'),
-                    'template_id': response_data.get('templateId'),
-                    'template_variables': Json(response_data.get('variables', {})),
-                    'actions_performed': Json(actions)
-                })
-                
-                logger.info(f"Saved response for record: {record_id}")
-                
-        except Exception as e:
-            logger.error(f"Failed to save response: {e}")
-            # Don't raise - we don't want DB errors to break the API response
+        self.writer.submit(self._insert_response, record_id, response_data, actions)
+    
+    @staticmethod
+    def _update_result(
+        cursor,
+        record_id: str,
+        decision: Dict[str, Any],
+        processing_time: float,
+        gpt_tokens: int = 0,
+        pre_filter_reason: Optional[str] = None,
+        skipped_gpt: bool = False
+    ):
+        """Write processing result columns using an open cursor."""
+        human_review = decision.get('humanReview', {})
+        cursor.execute(
+            """
+            UPDATE email_records SET
+                category = %s,
+                confidence = %s,
+                action = %s,
+                should_respond = %s,
+                sensitivity_flags = %s,
+                pre_filter_reason = %s,
+                skipped_gpt = %s,
+                processing_time_seconds = %s,
+                gpt_tokens_used = %s,
+                human_review_required = %s,
+                human_review_priority = %s,
+                human_review_reason = %s,
+                api_version = '2.0'
+            WHERE id = %s
+            """,
+            (
+                decision.get('category'),
+                decision.get('confidence'),
+                decision.get('action'),
+                decision.get('shouldRespond', False),
+                decision.get('sensitivityFlags', []),
+                pre_filter_reason,
+                skipped_gpt,
+                processing_time,
+                gpt_tokens,
+                human_review.get('required', False),
+                human_review.get('priority'),
+                human_review.get('reason'),
+                record_id
+            )
+        )
+    
+    @staticmethod
+    def _insert_response(
+        cursor,
+        record_id: str,
+        response_data: Dict[str, Any],
+        actions: List[Dict[str, Any]]
+    ):
+        """Upsert the response row using an open cursor."""
+        cursor.execute(
+            "EXECUTE upsert_response (%s, %s, %s, %s, %s, %s)",
+            (
+                record_id,
+                response_data.get('subject'),
+                response_data.get('bodyHtml'),
+                response_data.get('templateId'),
+                OJson(response_data.get('variables', {})),
+                OJson(actions)
+            )
+        )
+    
+    @staticmethod
+    def _step_rows(cursor, record_id: str, steps: 'StepLogger') -> str:
+        """Format buffered steps as COPY rows for the background writer to flush."""
+        return ''.join(
+            '\t'.join((
+                record_id,
+                _copy_text(level),
+                _copy_text(step),
+                _copy_text(message),
+                _copy_text(_dumps_json(metadata)) if metadata else '\\N',
+                logged_at.isoformat()
+            )) + '\n'
+            for level, step, message, metadata, logged_at in steps.steps
+        )
     
     def log_processing_step(
         self,
@@ -315,7 +915,7 @@ class EmailDatabase:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """
-        Log a processing step to database.
+        Queue a single processing step for the background writer.
         
         Args:
             record_id: UUID of email record
@@ -324,33 +924,9 @@ class EmailDatabase:
             message: Log message
             metadata: Additional metadata
         """
-        try:
-            with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO processing_logs (
-                        email_record_id,
-                        log_level,
-                        step,
-                        message,
-                        metadata
-                    ) VALUES (
-                        %(record_id)s::uuid,
-                        %(level)s,
-                        %(step)s,
-                        %(message)s,
-                        %(metadata)s
-                    )
-                """, {
-                    'record_id': record_id,
-                    'level': level,
-                    'step': step,
-                    'message': message,
-                    'metadata': Json(metadata) if metadata else None
-                })
-                
-        except Exception as e:
-            logger.error(f"Failed to log processing step: {e}")
-            # Don't raise - logging failures shouldn't break processing
+        steps = StepLogger()
+        steps.log(level, step, message, metadata)
+        self.writer.submit(self._step_rows, record_id, steps)
     
     def log_error(
         self,
@@ -358,95 +934,89 @@ class EmailDatabase:
         error_message: str
     ):
         """
-        Mark email record as having processing error.
+        Queue marking an email record as having a processing error.
         
         Args:
             record_id: UUID of email record
             error_message: Error message
         """
-        try:
-            with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    UPDATE email_records SET
-                        processing_error = TRUE,
-                        error_message = %(error_message)s
-                    WHERE id = %(record_id)s::uuid
-                """, {
-                    'record_id': record_id,
-                    'error_message': error_message
-                })
-                
-                logger.warning(f"Logged error for record {record_id}: {error_message}")
-                
-        except Exception as e:
-            logger.error(f"Failed to log error: {e}")
+        logger.warning("Logging error for record %s: %s", record_id, error_message)
+        self.writer.submit(self._mark_error, record_id, error_message)
+    
+    @staticmethod
+    def _mark_error(cursor, record_id: str, error_message: str):
+        """Mark a record as failed using an open cursor."""
+        cursor.execute("EXECUTE mark_error (%s, %s)", (record_id, error_message))
     
     def mark_response_sent(self, record_id: str):
         """
-        Mark that response has been sent for this email.
+        Queue marking that the response has been sent for this email.
         
         Args:
             record_id: UUID of email record
         """
-        try:
-            with self.pool.get_cursor() as cursor:
-                cursor.execute("""
-                    UPDATE email_records SET
-                        response_sent = TRUE,
-                        response_sent_at = NOW()
-                    WHERE id = %(record_id)s::uuid
-                """, {
-                    'record_id': record_id
-                })
-                
-                logger.info(f"Marked response sent for record: {record_id}")
-                
-        except Exception as e:
-            logger.error(f"Failed to mark response sent: {e}")
+        self.writer.submit(self._mark_response_sent, record_id)
     
-    def get_statistics(self, days: int = 30) -> Dict[str, Any]:
+    @staticmethod
+    def _mark_response_sent(cursor, record_id: str):
+        """Set response_sent on a record using an open cursor."""
+        cursor.execute("""
+            UPDATE email_records SET
+                response_sent = TRUE,
+                response_sent_at = NOW()
+            WHERE id = %s
+        """, (record_id,))
+    
+    def get_statistics(self, days: int = 30, fresh: bool = False) -> Dict[str, Any]:
         """
         Get processing statistics for the last N days.
         
+        Results are cached per `days` for STATS_CACHE_TTL_SECONDS, since
+        dashboards poll this and the aggregates scan email_records.
+        
         Args:
             days: Number of days to include
+            fresh: Bypass the cache and recompute
             
         Returns:
             Dictionary of statistics
         """
+        if not fresh:
+            with self._stats_lock:
+                entry = self._stats_cache.get(days)
+                if entry and entry[0] > time.monotonic():
+                    return entry[1]
+        
+        stats = self._query_statistics(days)
+        if stats:
+            with self._stats_lock:
+                self._stats_cache[days] = (time.monotonic() + self.STATS_CACHE_TTL_SECONDS, stats)
+                self._stats_cache.move_to_end(days)
+                while len(self._stats_cache) > self.STATS_CACHE_SIZE:
+                    self._stats_cache.popitem(last=False)
+        return stats
+    
+    def _query_statistics(self, days: int) -> Dict[str, Any]:
+        """Run the statistics aggregates (empty dict on error)."""
         try:
-            with self.pool.get_cursor() as cursor:
-                # Overall stats
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_emails,
-                        COUNT(*) FILTER (WHERE should_respond = TRUE) as responses_sent,
-                        COUNT(*) FILTER (WHERE skipped_gpt = TRUE) as pre_filtered,
-                        COUNT(*) FILTER (WHERE human_review_required = TRUE) as human_reviews,
-                        AVG(confidence) as avg_confidence,
-                        AVG(processing_time_seconds) as avg_processing_time,
-                        SUM(gpt_tokens_used) as total_gpt_tokens
-                    FROM email_records
-                    WHERE received_datetime >= NOW() - INTERVAL '%s days'
-                """, (days,))
+            with self.read_pool.get_cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute("EXECUTE statistics (%s)", (days,))
+                rows = cursor.fetchall()
                 
-                overall = dict(cursor.fetchone())
+                # The grand-total row sorts first
+                overall = rows[0]
+                del overall['category']
                 
                 # Category breakdown
-                cursor.execute("""
-                    SELECT 
-                        category,
-                        COUNT(*) as count,
-                        AVG(confidence) as avg_confidence
-                    FROM email_records
-                    WHERE received_datetime >= NOW() - INTERVAL '%s days'
-                        AND category IS NOT NULL
-                    GROUP BY category
-                    ORDER BY count DESC
-                    LIMIT 10
-                """, (days,))
-                
-                categories = [dict(row) for row in cursor.fetchall()]
+                categories = [
+                    {
+                        'category': row['category'],
+                        'count': row['total_emails'],
+                        'avg_confidence': row['avg_confidence']
+                    }
+                    for row in rows[1:]
+                    if row['category'] is not None
+                ][:10]
                 
                 return {
                     'period_days': days,
@@ -455,7 +1025,7 @@ class EmailDatabase:
                 }
                 
         except Exception as e:
-            logger.error(f"Failed to get statistics: {e}")
+            logger.error("Failed to get statistics: %s", e)
             return {}
     
     def get_recent_emails(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -469,7 +1039,7 @@ class EmailDatabase:
             List of email record dictionaries
         """
         try:
-            with self.pool.get_cursor() as cursor:
+            with self.read_pool.get_cursor(commit=False, cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
                     SELECT 
                         id::text,
@@ -490,23 +1060,350 @@ class EmailDatabase:
                     LIMIT %s
                 """, (limit,))
                 
-                return [dict(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
                 
         except Exception as e:
-            logger.error(f"Failed to get recent emails: {e}")
+            logger.error("Failed to get recent emails: %s", e)
             return []
 
 
+# ============================================================================
+# GPT RESPONSE CACHE
+# ============================================================================
+
+class ExpiredRowPruner:
+    """
+    Rate-limited deletion of expired rows from a cache table.
+    
+    Lookups already ignore expired rows; this only reclaims their space.
+    It covers the whole table, so entries that are never written again
+    (e.g. a sender who stops emailing) still go. At most one prune runs
+    per interval per process, on a background thread, and rows are
+    deleted BATCH_SIZE at a time by ctid so each transaction stays short.
+    """
+    
+    BATCH_SIZE = 1000
+    MAX_BATCHES = 20
+    
+    def __init__(self, pool: DatabasePool, table: str, interval_seconds: int = 300):
+        """
+        Initialize pruner.
+        
+        Args:
+            pool: Database connection pool
+            table: Table with an expires_at column
+            interval_seconds: Minimum seconds between prunes
+        """
+        self.pool = pool
+        self.table = table
+        self.interval_seconds = interval_seconds
+        self._next_run = 0.0  # first write after startup prunes
+        self._lock = threading.Lock()
+        self._sql = f"""
+            DELETE FROM {table}
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM {table}
+                WHERE expires_at <= NOW()
+                LIMIT %s
+            ))
+              AND expires_at <= NOW()
+        """
+    
+    def maybe_prune(self):
+        """Start a background prune if the interval has passed."""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_run:
+                return
+            self._next_run = now + self.interval_seconds
+        
+        threading.Thread(target=self.prune, name=f'prune-{self.table}', daemon=True).start()
+    
+    def prune(self) -> int:
+        """
+        Delete expired rows in batches.
+        
+        Returns:
+            Number of rows deleted
+        """
+        deleted = 0
+        try:
+            for _ in range(self.MAX_BATCHES):
+                with self.pool.get_cursor() as cursor:
+                    cursor.execute(self._sql, (self.BATCH_SIZE,))
+                    deleted += cursor.rowcount
+                    if cursor.rowcount < self.BATCH_SIZE:
+                        break
+        except Exception as e:
+            logger.error("Failed to prune %s: %s", self.table, e)
+        
+        if deleted:
+            logger.info("Pruned %s expired rows from %s", deleted, self.table)
+        return deleted
+
+
+class ResponseCache:
+    """
+    Exact-match cache of GPT analyses shared by all workers.
+    
+    Entries are keyed by a digest of everything that shapes the GPT
+    answer (normalized email, context, prompt, model, temperature), so a
+    stored analysis can be reused whenever the same request recurs.
+    
+    Entries expire after ttl_seconds, so answers age out when prompt or
+    context drift is not captured by the key, and expired rows are pruned.
+    
+    Recently seen entries are also kept in a per-process LRU with a TTL,
+    so repeat traffic is answered without a database round trip. Hits
+    served from the local tier are not added to the hits column.
+    """
+    
+    def __init__(
+        self,
+        pool: DatabasePool,
+        ttl_seconds: int = 604800,
+        local_size: int = 10000,
+        local_ttl_seconds: int = 600
+    ):
+        """
+        Initialize response cache.
+        
+        Args:
+            pool: Database connection pool
+            ttl_seconds: Seconds before a stored entry expires
+            local_size: Maximum entries in the in-process tier (0 = disabled)
+            local_ttl_seconds: Seconds an entry stays in the in-process tier
+                (capped at ttl_seconds)
+        """
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self.local_size = local_size
+        self.local_ttl_seconds = min(local_ttl_seconds, ttl_seconds)
+        self._local = OrderedDict()  # cache_key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self.pruner = ExpiredRowPruner(pool, 'gpt_response_cache')
+        logger.info(
+            "ResponseCache initialized: ttl=%ss, local_size=%s, local_ttl=%ss",
+            ttl_seconds, local_size, self.local_ttl_seconds
+        )
+    
+    def get(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached GPT analysis and count the hit.
+        
+        Args:
+            cache_key: Digest of the request
+        
+        Returns:
+            Cached analysis dictionary, or None on a miss or error
+        """
+        response = self._get_local(cache_key)
+        if response is not None:
+            return response
+        
+        try:
+            with self.pool.get_cursor() as cursor:
+                cursor.execute("""
+                    UPDATE gpt_response_cache
+                    SET hits = hits + 1
+                    WHERE cache_key = %s
+                      AND expires_at > NOW()
+                    RETURNING response
+                """, (cache_key,))
+                
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                
+                self._put_local(cache_key, row[0])
+                return row[0]
+        
+        except Exception as e:
+            logger.error("Failed to read response cache: %s", e)
+            return None
+    
+    def put(self, cache_key: bytes, response: Dict[str, Any], model: str):
+        """
+        Store a GPT analysis (first writer wins while the entry is live).
+        
+        Args:
+            cache_key: Digest of the request
+            response: Analysis dictionary to cache
+            model: Model that produced the analysis
+        """
+        self._put_local(cache_key, response)
+        
+        try:
+            with self.pool.get_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO gpt_response_cache (cache_key, response, model, expires_at)
+                    VALUES (%s, %s, %s, NOW() + make_interval(secs => %s))
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                        response = EXCLUDED.response,
+                        model = EXCLUDED.model,
+                        hits = 0,
+                        created_at = NOW(),
+                        expires_at = EXCLUDED.expires_at
+                    WHERE gpt_response_cache.expires_at <= NOW()
+                """, (cache_key, OJson(response), model, self.ttl_seconds))
+        
+        except Exception as e:
+            logger.error("Failed to write response cache: %s", e)
+            # Don't raise - a cache write failure shouldn't break processing
+        
+        self.pruner.maybe_prune()
+    
+    def _get_local(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a live entry from the in-process tier, or None."""
+        if not self.local_size:
+            return None
+        with self._lock:
+            entry = self._local.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._local[cache_key]
+                return None
+            self._local.move_to_end(cache_key)
+            return response
+    
+    def _put_local(self, cache_key: bytes, response: Dict[str, Any]):
+        """Store an entry in the in-process tier, evicting the oldest if full."""
+        if not self.local_size:
+            return
+        with self._lock:
+            self._local[cache_key] = (time.monotonic() + self.local_ttl_seconds, response)
+            self._local.move_to_end(cache_key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache of GPT analyses backed by pgvector.
+    
+    Entries are namespaced (sender plus user context) so an analysis is
+    only reused for the same person with the same bookings/certificates,
+    and expire after a TTL so stale answers age out.
+    """
+    
+    def __init__(self, pool: DatabasePool, threshold: float, ttl_seconds: int):
+        """
+        Initialize semantic cache.
+        
+        Args:
+            pool: Database connection pool
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Seconds before an entry expires
+        """
+        self.pool = pool
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.pruner = ExpiredRowPruner(pool, 'email_embeddings')
+        logger.info("Semantic cache initialized: threshold=%s, ttl=%ss", threshold, ttl_seconds)
+    
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar live analysis in a namespace.
+        
+        The (namespace, expires_at) index narrows the scan to this
+        namespace's live rows, which are then ranked by exact distance.
+        
+        Args:
+            namespace: Cache namespace
+            embedding: Embedding of the incoming email
+        
+        Returns:
+            Cached analysis dictionary if similarity meets the threshold, else None
+        """
+        try:
+            with self.pool.get_cursor() as cursor:
+                cursor.execute("""
+                    SELECT response, 1 - (embedding <=> %(embedding)s::vector) AS similarity
+                    FROM email_embeddings
+                    WHERE namespace = %(namespace)s
+                      AND expires_at > NOW()
+                    ORDER BY embedding <=> %(embedding)s::vector
+                    LIMIT 1
+                """, {
+                    'namespace': namespace,
+                    'embedding': self._vector_literal(embedding)
+                })
+                
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                
+                response, similarity = row
+                if similarity >= self.threshold:
+                    logger.debug("Semantic cache similarity: %.3f", similarity)
+                    return response
+                return None
+        
+        except Exception as e:
+            logger.error("Failed to read semantic cache: %s", e)
+            return None
+    
+    def add(self, namespace: str, embedding: List[float], response: Dict[str, Any]):
+        """
+        Store an analysis, periodically pruning expired entries.
+        
+        Args:
+            namespace: Cache namespace
+            embedding: Embedding of the email
+            response: Analysis dictionary to cache
+        """
+        try:
+            with self.pool.get_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO email_embeddings (namespace, embedding, response, expires_at)
+                    VALUES (
+                        %(namespace)s,
+                        %(embedding)s::vector,
+                        %(response)s,
+                        NOW() + make_interval(secs => %(ttl)s)
+                    )
+                """, {
+                    'namespace': namespace,
+                    'embedding': self._vector_literal(embedding),
+                    'response': OJson(response),
+                    'ttl': self.ttl_seconds
+                })
+        
+        except Exception as e:
+            logger.error("Failed to write semantic cache: %s", e)
+            # Don't raise - a cache write failure shouldn't break processing
+        
+        self.pruner.maybe_prune()
+    
+    @staticmethod
+    def _vector_literal(embedding: List[float]) -> str:
+        """Format an embedding as a pgvector text literal."""
+        return '[' + ','.join(map(repr, embedding)) + ']'
+
+
 # ============================================================================
 # DATABASE INITIALIZATION
 # ============================================================================
 
-def init_database_pool(database_url: Optional[str] = None) -> DatabasePool:
+def init_database_pool(
+    database_url: Optional[str] = None,
+    read_only: bool = False
+) -> DatabasePool:
     """
     Initialize database connection pool from environment.
     
+    The write pool defaults to 2-max(4, 2 x CPU cores) connections, since
+    past roughly twice the core count extra connections only add
+    contention on the server. DB_POOL_MIN/DB_POOL_MAX override it. The
+    read-only pool serves dashboard queries and is sized by
+    DB_READ_POOL_MAX (default 2), so long reads cannot take connections
+    from the write path.
+    
     Args:
         database_url: Database connection string (optional, reads from env)
+        read_only: Create the read-only pool instead of the write pool
         
     Returns:
         Initialized DatabasePool
@@ -517,6 +1414,13 @@ def init_database_pool(database_url: Optional[str] = None) -> DatabasePool:
     if not database_url:
         raise ValueError("DATABASE_URL environment variable not set")
     
-    logger.info(f"Initializing database connection...")
+    if read_only:
+        min_conn = 1
+        max_conn = int(os.getenv('DB_READ_POOL_MAX') or 2)
+    else:
+        min_conn = int(os.getenv('DB_POOL_MIN') or 2)
+        max_conn = int(os.getenv('DB_POOL_MAX') or max(4, 2 * (os.cpu_count() or 1)))
+    
+    logger.info("Initializing database connection...")
     
-    return DatabasePool(database_url)
+    return DatabasePool(database_url, min(min_conn, max_conn), max_conn, read_only=read_only)
@@ -0,0 +1,163 @@
+"""
+REdI Email Processing API - Data Models
+=======================================
+
+Dataclasses passed between the processing stages. Kept free of service
+setup so they can be imported without a database or OpenAI client.
+
+Author: Sean Wing
+Date: 2026-01-02
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+
+
+# ============================================================================
+# DATA MODELS
+# ============================================================================
+
+@dataclass(slots=True)
+class EmailContext:
+    """Context data about the user (bookings, certificates)"""
+    user_bookings: List[Dict[str, Any]]
+    user_certificates: List[Dict[str, Any]]
+
+
+@dataclass(slots=True)
+class FilterResult:
+    """Result of pre-filtering check"""
+    skip_gpt: bool
+    reason: str
+    confidence: float
+    category: str
+
+
+@dataclass(slots=True)
+class SensitivityResult:
+    """Result of sensitivity detection"""
+    flags: List[str]
+    max_confidence: float
+    should_block: bool
+    reasoning: str
+
+
+# Expected type, default and whether JSON null means "use the default"
+# for each field of a GPT analysis
+_GPT_RESPONSE_FIELDS = {
+    'is_new_email': (bool, True, False),
+    'sender_first_name': (str, '', True),
+    'enquiry_type': (str, 'general', False),
+    'recommended_response': (str, '', True),
+    'confidence': ((int, float), 0.5, False),
+    'action': (str, 'none', False)
+}
+
+
+@dataclass(slots=True)
+class GPTResponse:
+    """Structured response from GPT"""
+    is_new_email: bool
+    sender_first_name: str
+    enquiry_type: str
+    recommended_response: str
+    confidence: float
+    action: str
+    cache_hit: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the analysis fields to a dictionary (as returned by GPT)."""
+        return {
+            'is_new_email': self.is_new_email,
+            'sender_first_name': self.sender_first_name,
+            'enquiry_type': self.enquiry_type,
+            'recommended_response': self.recommended_response,
+            'confidence': self.confidence,
+            'action': self.action
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> 'GPTResponse':
+        """
+        Build a GPTResponse from a decoded GPT JSON object.
+        
+        Missing fields take their defaults, as do null values of the
+        optional text fields (GPT returns null when it finds no name or
+        suggested reply). A field of the wrong type is rejected, so a
+        malformed answer is handled like unparseable JSON and is never
+        cached.
+        
+        Args:
+            data: Decoded JSON object for one email
+            
+        Returns:
+            GPTResponse
+            
+        Raises:
+            ValueError: If data is not an object or a field is invalid
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+        
+        values = {}
+        for name, (expected, default, nullable) in _GPT_RESPONSE_FIELDS.items():
+            value = data.get(name, default)
+            if value is None and nullable:
+                value = default
+            # bool is an int subclass, so only accept it where bool is expected
+            if not isinstance(value, expected) or (expected is not bool and isinstance(value, bool)):
+                raise ValueError(f"invalid {name}: {value!r:.50}")
+            values[name] = value
+        
+        if not 0 <= values['confidence'] <= 1:
+            raise ValueError(f"confidence out of range: {values['confidence']}")
+        
+        return cls(**values)
+
+
+@dataclass(slots=True)
+class ProcessingDecision:
+    """Final decision about how to handle email"""
+    should_respond: bool
+    confidence: float
+    category: str
+    action: str
+    reasoning_chain: List[str]
+    sensitivity_flags: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (same shape as dataclasses.asdict)."""
+        return {
+            'should_respond': self.should_respond,
+            'confidence': self.confidence,
+            'category': self.category,
+            'action': self.action,
+            'reasoning_chain': list(self.reasoning_chain),
+            'sensitivity_flags': list(self.sensitivity_flags)
+        }
+
+
+@dataclass(slots=True)
+class APIResponse:
+    """Complete API response structure"""
+    success: bool
+    processing_time: float
+    decision: ProcessingDecision
+    response: Optional[Dict[str, Any]]
+    actions: List[Dict[str, Any]]
+    human_review: Dict[str, Any]
+    metadata: Dict[str, Any]
+    error: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (same shape as dataclasses.asdict)."""
+        return {
+            'success': self.success,
+            'processing_time': self.processing_time,
+            'decision': self.decision.to_dict(),
+            'response': self.response,
+            'actions': self.actions,
+            'human_review': self.human_review,
+            'metadata': self.metadata,
+            'error': self.error
+        }
@@ -0,0 +1,76 @@
+"""
+REdI Email Processing API - GPTResponse parsing tests
+=====================================================
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models import GPTResponse
+
+
+ANALYSIS = {
+    'is_new_email': True,
+    'sender_first_name': 'Jane',
+    'enquiry_type': 'certificate request',
+    'recommended_response': 'Your certificate is attached.',
+    'confidence': 0.9,
+    'action': 'send_certificate'
+}
+
+
+def test_null_optional_text_fields_take_defaults():
+    data = dict(ANALYSIS, sender_first_name=None, recommended_response=None)
+    
+    response = GPTResponse.from_dict(data)
+    
+    assert response.sender_first_name == ''
+    assert response.recommended_response == ''
+    assert response.action == 'send_certificate'
+    assert response.confidence == 0.9
+
+
+def test_wrong_type_is_rejected():
+    with pytest.raises(ValueError):
+        GPTResponse.from_dict(dict(ANALYSIS, sender_first_name=42))
+
+
+def test_null_required_field_is_rejected():
+    with pytest.raises(ValueError):
+        GPTResponse.from_dict(dict(ANALYSIS, confidence=None))
+
+
+def test_missing_fields_take_defaults():
+    response = GPTResponse.from_dict({'confidence': 0.7})
+    
+    assert response.is_new_email is True
+    assert response.enquiry_type == 'general'
+    assert response.action == 'none'
+
+
+@pytest.mark.parametrize('field, value', [
+    ('is_new_email', 'yes'),
+    ('is_new_email', None),
+    ('confidence', '0.9'),
+    ('confidence', True),
+    ('action', ['send_certificate']),
+    ('enquiry_type', None)
+])
+def test_invalid_field_is_rejected(field, value):
+    with pytest.raises(ValueError):
+        GPTResponse.from_dict(dict(ANALYSIS, **{field: value}))
+
+
+def test_out_of_range_confidence_is_rejected():
+    with pytest.raises(ValueError):
+        GPTResponse.from_dict(dict(ANALYSIS, confidence=1.5))
+
+
+@pytest.mark.parametrize('data', [None, [], 'text'])
+def test_non_object_is_rejected(data):
+    with pytest.raises(ValueError):
+        GPTResponse.from_dict(data)